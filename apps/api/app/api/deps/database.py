@@ -1,13 +1,7 @@
 """Database dependencies for FastAPI routes."""
 
-from collections.abc import AsyncGenerator
-
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.core.database import async_session_factory
-
-
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
-        yield session
+from app.core.database import get_async_session
 
+# The request-scoped session every route depends on. It is the same callable as
+# ``get_async_session`` so one ``dependency_overrides`` entry replaces it everywhere.
+get_db = get_async_session
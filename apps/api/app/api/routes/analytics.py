@@ -1,9 +1,12 @@
 """Analytics endpoints."""
 
-from fastapi import APIRouter, Depends
+import datetime as dt
 
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps.database import get_db
 from app.auth.dependencies import get_current_user
-from app.core.database import async_session_factory
 from app.schemas.analytics import AnalyticsOverview
 from app.services.analytics_service import AnalyticsService
 
@@ -12,8 +15,13 @@ router = APIRouter()
 
 
 @router.get("/overview", response_model=AnalyticsOverview, summary="Get analytics overview")
-async def analytics_overview(current_user: dict = Depends(get_current_user)) -> dict:
-    async with async_session_factory() as session:
-        service = AnalyticsService(session)
-        return await service.get_overview()
+async def analytics_overview(
+    exam_id: int | None = Query(None, description="Limit the overview to one exam"),
+    since: dt.datetime | None = Query(None, description="Only evaluations created at or after this time"),
+    until: dt.datetime | None = Query(None, description="Only evaluations created before this time"),
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict:
+    service = AnalyticsService(session)
+    return await service.get_overview(exam_id=exam_id, since=since, until=until)
 
@@ -1,34 +1,56 @@
 """Batch processing routes."""
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps.database import get_db
 from app.auth.dependencies import get_current_user
 from app.celery_app import celery_app
-from app.core.database import async_session_factory
 from app.repositories.job import JobRepository
+from app.repositories.submission import SubmissionRepository
 from app.schemas.jobs import BatchRequest, JobStatus
-from app.services.batch_service import BatchProcessingService
+from app.services.batch_service import BatchProcessingService, owns_job
+from app.services.progress_service import JobProgressTracker
 
 
 router = APIRouter()
+progress_tracker = JobProgressTracker()
 
 
 @router.post("/", response_model=JobStatus, summary="Create a batch processing job")
-async def create_batch_job(payload: BatchRequest, current_user: dict = Depends(get_current_user)) -> JobStatus:
-    async with async_session_factory() as session:
-        service = BatchProcessingService(JobRepository(session))
-        job = await service.create_job("batch_upload", metadata={"exam_id": payload.exam_id, "user_id": current_user["id"]})
-
-    celery_app.send_task("app.tasks.batch.process", args=[job.job_id, payload.files])
+async def create_batch_job(
+    payload: BatchRequest,
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> JobStatus:
+    # Only the caller's own uploads for this exam can be batched
+    submission_ids = list(dict.fromkeys(payload.submission_ids))
+    owned = await SubmissionRepository(session).owned_ids(int(current_user["id"]), payload.exam_id, submission_ids)
+    if len(owned) != len(submission_ids):
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    service = BatchProcessingService(JobRepository(session))
+    job = await service.create_job("batch_upload", metadata={"exam_id": payload.exam_id, "user_id": current_user["id"]})
+
+    celery_app.send_task("app.tasks.batch.process", args=[job.job_id, submission_ids])
     return JobStatus(job_id=job.job_id, status=job.status, progress=job.progress, created_at=job.created_at)
 
 
 @router.get("/{job_id}", response_model=JobStatus, summary="Get batch job status")
-async def get_batch_job(job_id: str, current_user: dict = Depends(get_current_user)) -> JobStatus:
-    async with async_session_factory() as session:
-        repo = JobRepository(session)
-        job = await repo.get_by_job_id(job_id)
-        if job is None:
-            raise HTTPException(status_code=404, detail="Job not found")
-        return JobStatus(job_id=job.job_id, status=job.status, progress=job.progress, result=job.result, created_at=job.created_at)
-
+async def get_batch_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> JobStatus:
+    repo = JobRepository(session)
+    job = await repo.get_by_job_id(job_id)
+    if job is None or not owns_job(job.job_metadata, current_user):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    # Live progress comes from the Redis counters; the Job row only holds checkpoints
+    progress = job.progress
+    if job.status == "processing":
+        snapshot = await progress_tracker.get_async(job_id)
+        if snapshot is not None:
+            progress = max(progress, snapshot["progress"])
+    return JobStatus(job_id=job.job_id, status=job.status, progress=progress, result=job.result, created_at=job.created_at)
@@ -0,0 +1,72 @@
+"""Server-Sent Events streams for submission and batch job progress."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps.database import get_db
+from app.auth.dependencies import get_stream_user
+from app.models import Job, Submission
+from app.services.batch_service import owns_job
+from app.services.event_service import (
+    JOB_TERMINAL_STAGES,
+    SUBMISSION_TERMINAL_STAGES,
+    job_channel,
+    status_event,
+    stream_events,
+    submission_channel,
+)
+
+
+router = APIRouter(prefix="/events")
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.get("/submissions/{submission_id}", summary="Stream submission stage transitions")
+async def submission_events(
+    submission_id: int,
+    current_user: dict = Depends(get_stream_user),
+    session: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    # Current status, used when Redis no longer holds a snapshot for this channel
+    row = (
+        await session.execute(select(Submission.status, Submission.user_id).where(Submission.id == submission_id))
+    ).first()
+    if row is None or row.user_id != int(current_user["id"]):
+        raise HTTPException(status_code=404, detail="Submission not found")
+    # Release the connection before the long-lived stream starts
+    await session.close()
+    return StreamingResponse(
+        stream_events(
+            submission_channel(submission_id),
+            SUBMISSION_TERMINAL_STAGES,
+            fallback=status_event("submission", row.status, submission_id=submission_id),
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/batch/{job_id}", summary="Stream batch job progress")
+async def batch_events(
+    job_id: str,
+    current_user: dict = Depends(get_stream_user),
+    session: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    row = (
+        await session.execute(select(Job.status, Job.progress, Job.job_metadata).where(Job.job_id == job_id))
+    ).first()
+    if row is None or not owns_job(row.job_metadata, current_user):
+        raise HTTPException(status_code=404, detail="Job not found")
+    await session.close()
+    return StreamingResponse(
+        stream_events(
+            job_channel(job_id),
+            JOB_TERMINAL_STAGES,
+            fallback=status_event("job", row.status, job_id=job_id, progress=row.progress),
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
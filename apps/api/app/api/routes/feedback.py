@@ -1,11 +1,15 @@
 """Feedback submission routes."""
 
 from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps.database import get_db
 from app.auth.dependencies import get_current_user
-from app.core.database import async_session_factory
+from app.models import Evaluation, Submission
 from app.repositories.feedback import FeedbackRepository
 from app.schemas.feedback import FeedbackCreate
+from app.services.analytics_cache_service import invalidate_analytics_async
 from app.services.feedback_service import FeedbackService
 
 
@@ -13,16 +17,27 @@ router = APIRouter()
 
 
 @router.post("/", summary="Submit feedback for an evaluation")
-async def submit_feedback(payload: FeedbackCreate, current_user: dict = Depends(get_current_user)) -> dict:
-    async with async_session_factory() as session:
-        repo = FeedbackRepository(session)
-        service = FeedbackService(repo)
-        feedback = await service.submit_feedback(
-            evaluation_id=payload.evaluation_id,
-            teacher_id=int(current_user["id"]),
-            comments=payload.comments,
-            suggested_score=payload.suggested_score,
+async def submit_feedback(
+    payload: FeedbackCreate,
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict:
+    repo = FeedbackRepository(session)
+    service = FeedbackService(repo)
+    feedback = await service.submit_feedback(
+        evaluation_id=payload.evaluation_id,
+        teacher_id=int(current_user["id"]),
+        comments=payload.comments,
+        suggested_score=payload.suggested_score,
+    )
+    exam_id = (
+        await session.execute(
+            select(Submission.exam_id)
+            .join(Evaluation, Evaluation.submission_id == Submission.id)
+            .where(Evaluation.id == payload.evaluation_id)
         )
+    ).scalar()
+    await invalidate_analytics_async(exam_id)
     return {"feedback_id": feedback.id, "status": "received"}
 
 
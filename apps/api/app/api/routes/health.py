@@ -2,6 +2,9 @@
 
 from fastapi import APIRouter
 
+from app.core.database import async_engine
+from app.core.pool_metrics import pool_metrics
+
 
 router = APIRouter()
 
@@ -11,6 +14,7 @@ async def healthz() -> dict[str, str]:
     return {"status": "ok"}
 
 
-
-
-
+@router.get("/healthz/db-pool", summary="Database pool checkout latency and saturation")
+async def db_pool() -> dict:
+    """Stats for this API process's pool; each replica reports its own."""
+    return pool_metrics(async_engine.pool)
@@ -1,51 +1,158 @@
 """Submissions listing endpoint."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+import re
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
+from app.api.deps.database import get_db
 from app.auth.dependencies import get_current_user
-from app.core.database import async_session_factory
-from app.models import Submission
+from app.models import Evaluation, Feedback, Submission
+from app.repositories.submission import SubmissionRepository, decode_cursor, encode_cursor
+from app.services.analytics_cache_service import invalidate_analytics_async
+from app.services.storage_service import StorageService
+from app.utils.storage import get_storage_backend
 
 
 router = APIRouter()
 
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=start-end`` range into ``[start, end)``."""
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size
+    else:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    if start >= size or start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
 
 @router.get("/submissions", summary="Get all submissions for current user")
-async def list_submissions(current_user: dict = Depends(get_current_user)) -> dict:
-    """Get all submissions for the current user."""
+async def list_submissions(
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(50, ge=1, le=200),
+    status_filter: str | None = Query(None, alias="status"),
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict:
+    """Get the current user's submissions, newest first, one page at a time."""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    repo = SubmissionRepository(session)
+    rows = await repo.list_page_for_user(int(current_user["id"]), limit, cursor=after, status=status_filter)
+
+    page = rows[:limit]
+    submission_list = [
+        {
+            "id": row.id,
+            "exam_id": row.exam_id,
+            "status": row.status,
+            "storage_path": row.storage_path,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "has_evaluation": row.evaluation_id is not None,
+            "score": row.final_score,
+            "confidence": row.confidence,
+        }
+        for row in page
+    ]
+    next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+
+    return {
+        "submissions": submission_list,
+        "count": len(submission_list),
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/submissions/stats", summary="Submission totals for the current user")
+async def submission_stats(
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict:
+    """Counts over all of the user's submissions, independent of list pagination."""
+    return await SubmissionRepository(session).counts_for_user(int(current_user["id"]))
+
+
+@router.delete("/submissions/{submission_id}", summary="Delete a submission and release its upload")
+async def delete_submission(
+    submission_id: int,
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict:
+    submission = await session.get(Submission, submission_id)
+    if submission is None or submission.user_id != int(current_user["id"]):
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    evaluation_ids = select(Evaluation.id).where(Evaluation.submission_id == submission_id)
+    await session.execute(delete(Feedback).where(Feedback.evaluation_id.in_(evaluation_ids)))
+    # Deleted through the ORM so the analytics aggregates are adjusted
+    evaluation = (await session.execute(select(Evaluation).where(Evaluation.submission_id == submission_id))).scalars().first()
+    if evaluation is not None:
+        await session.delete(evaluation)
+    # Later duplicates keep their own copy of the results
+    await session.execute(
+        update(Submission).where(Submission.duplicate_of_id == submission_id).values(duplicate_of_id=None)
+    )
+
+    storage = StorageService(session)
+    orphaned_path = await storage.release(submission.content_hash) if submission.content_hash else None
+    await session.delete(submission)
+    await session.commit()
+    if evaluation is not None:
+        await invalidate_analytics_async(submission.exam_id)
+
+    # The blob goes only after the last reference is committed away
+    if orphaned_path is not None:
+        await storage.remove_blob(orphaned_path)
+    return {"submission_id": submission_id, "deleted": True, "storage_released": orphaned_path is not None}
+
+
+@router.get("/submissions/{submission_id}/file", summary="Download the uploaded answer sheet")
+async def download_submission_file(
+    submission_id: int,
+    range_header: str | None = Header(None, alias="Range"),
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    submission = await session.get(Submission, submission_id)
+    if submission is None or submission.user_id != int(current_user["id"]):
+        raise HTTPException(status_code=404, detail="Submission not found")
+    # Hand the connection back to the pool before a potentially long download
+    await session.close()
+
+    storage = get_storage_backend()
     try:
-        async with async_session_factory() as session:
-            user_id = int(current_user["id"])
-            query = select(Submission).where(Submission.user_id == user_id).order_by(Submission.created_at.desc())
-            result = await session.execute(query)
-            submissions = result.scalars().all()
-            
-            # Process submissions outside of the session
-            submission_list = []
-            for sub in submissions:
-                try:
-                    submission_dict = {
-                        "id": sub.id,
-                        "exam_id": sub.exam_id,
-                        "status": sub.status,
-                        "storage_path": sub.storage_path,
-                        "created_at": sub.created_at.isoformat() if sub.created_at else None,
-                        "has_evaluation": sub.evaluation is not None if hasattr(sub, 'evaluation') else False,
-                        "score": sub.evaluation.final_score if hasattr(sub, 'evaluation') and sub.evaluation else None,
-                        "confidence": sub.evaluation.confidence if hasattr(sub, 'evaluation') and sub.evaluation else None,
-                    }
-                    submission_list.append(submission_dict)
-                except Exception:
-                    continue
-            
-            return {
-                "submissions": submission_list,
-                "total": len(submission_list)
-            }
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return {"submissions": [], "total": 0}
+        size = await run_in_threadpool(storage.size, submission.storage_path)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Stored file not found") from exc
 
+    byte_range = _parse_range(range_header, size) if range_header else None
+    start, end = byte_range or (0, size)
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(end - start)}
+    if byte_range is not None:
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    return StreamingResponse(
+        storage.iter_chunks(submission.storage_path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range is not None else status.HTTP_200_OK,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
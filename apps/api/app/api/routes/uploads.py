@@ -1,16 +1,15 @@
 """Upload routes."""
 
-import os
-import uuid
-from pathlib import Path
-
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps.database import get_db
 from app.auth.dependencies import get_current_user
-from app.core.database import async_session_factory
+from app.core.config import settings
 from app.models import Submission
 from app.repositories.submission import SubmissionRepository
-from app.utils.storage import save_locally
+from app.services.storage_service import StorageService
+from app.utils.storage import EmptyUploadError, UploadTooLargeError, save_upload_content_addressed
 
 
 router = APIRouter()
@@ -21,51 +20,58 @@ async def upload_answer_sheet(
     exam_id: int = Form(...),
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
 ) -> dict:
+    # Reject early when the client declared the size up front
+    if settings.UPLOAD_MAX_BYTES and file.size is not None and file.size > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the {settings.UPLOAD_MAX_BYTES} byte upload limit",
+        )
+
     try:
-        # Get the base directory (apps/api)
-        base_dir = Path(__file__).parent.parent.parent.parent
-        storage_dir = base_dir / "storage"
-        
-        # Ensure storage directory exists
-        storage_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate unique filename
-        filename = f"{uuid.uuid4()}_{file.filename or 'upload'}"
-        storage_path = storage_dir / filename
-        
-        # Read file content
-        file_content = await file.read()
-        
-        if not file_content:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="File is empty"
-            )
-        
-        # Save file
-        save_locally(storage_path, file_content)
-        
-        # Store relative path in database
-        relative_path = f"storage/{filename}"
-        
-        async with async_session_factory() as session:
-            repo = SubmissionRepository(session)
-            submission = Submission(
-                user_id=int(current_user["id"]), 
-                exam_id=exam_id, 
-                storage_path=relative_path
-            )
-            submission = await repo.create(submission)
+        # Stream to the storage backend in chunks; the key is derived from the content hash
+        stored = await save_upload_content_addressed(file)
+    except EmptyUploadError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Upload failed: {str(e)}"
+        )
+
+    storage = StorageService(session)
+    try:
+        # The reference and the submission are committed together
+        await storage.acquire(stored)
+
+        # Re-uploads of the same scan for this exam link to the original
+        original = await storage.find_duplicate(exam_id, stored.sha256)
 
-        return {
-            "submission_id": submission.id, 
-            "status": submission.status, 
-            "storage_path": submission.storage_path
-        }
+        repo = SubmissionRepository(session)
+        submission = Submission(
+            user_id=int(current_user["id"]),
+            exam_id=exam_id,
+            storage_path=stored.key,
+            content_hash=stored.sha256,
+            duplicate_of_id=original.id if original is not None else None,
+        )
+        submission = await repo.create(submission)
     except Exception as e:
+        await session.rollback()
+        await storage.discard_if_unreferenced(stored)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Upload failed: {str(e)}"
         )
 
+    return {
+        "submission_id": submission.id,
+        "status": submission.status,
+        "storage_path": submission.storage_path,
+        "size": stored.size,
+        "sha256": stored.sha256,
+        "duplicate_of": submission.duplicate_of_id,
+    }
@@ -1,26 +1,47 @@
 """Authentication dependencies for FastAPI routes."""
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 
 from app.auth.jwt import decode_token
+from app.auth.token_cache import get_token_cache
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
 def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
-    try:
-        payload = decode_token(token)
-        subject: str | None = payload.get("sub")
-        if subject is None:
+    """Resolve the caller from the access token alone.
+
+    ``role`` and ``is_active`` come from the token's claims, so routes can make
+    authorization decisions without loading the user row. Tokens issued before
+    those claims existed resolve with ``role=None`` and ``is_active=True``.
+    """
+    cache = get_token_cache()
+    payload = cache.get(token)
+    if payload is None:
+        try:
+            payload = decode_token(token)
+        except JWTError as exc:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials") from exc
+        if payload.get("sub") is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication")
-        return {"id": subject}
-    except JWTError as exc:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials") from exc
-
-
-
-
+        cache.put(token, payload)
+    if not payload.get("is_active", True):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return {"id": payload["sub"], "role": payload.get("role"), "is_active": payload.get("is_active", True)}
+
+
+def get_stream_user(
+    token: str | None = Depends(optional_oauth2_scheme),
+    access_token: str | None = Query(None, description="Bearer token for EventSource clients"),
+) -> dict:
+    """Like ``get_current_user`` but also accepts ``?access_token=``, since browser
+    ``EventSource`` connections cannot send an Authorization header."""
+    token = token or access_token
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return get_current_user(token)
 
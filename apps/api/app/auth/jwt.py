@@ -8,15 +8,16 @@ from jose import jwt
 from app.core.config import settings
 
 
-def _create_token(subject: str, expires_delta: timedelta, secret: str) -> str:
+def _create_token(subject: str, expires_delta: timedelta, secret: str, claims: dict[str, Any] | None = None) -> str:
     expire = datetime.utcnow() + expires_delta
-    to_encode = {"sub": subject, "exp": expire}
+    to_encode = {**(claims or {}), "sub": subject, "exp": expire}
     return jwt.encode(to_encode, secret, algorithm=settings.JWT_ALGORITHM)
 
 
-def create_access_token(subject: str, expires_minutes: int | None = None) -> str:
+def create_access_token(subject: str, expires_minutes: int | None = None, claims: dict[str, Any] | None = None) -> str:
+    """``claims`` are extra fields (e.g. ``role``, ``is_active``) carried in the token."""
     delta = timedelta(minutes=expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    return _create_token(subject, delta, settings.JWT_SECRET_KEY)
+    return _create_token(subject, delta, settings.JWT_SECRET_KEY, claims)
 
 
 def create_refresh_token(subject: str, expires_minutes: int | None = None) -> str:
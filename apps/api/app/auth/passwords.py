@@ -0,0 +1,61 @@
+"""Password hashing helpers.
+
+bcrypt is deliberately slow (~250 ms at cost 12), so the async helpers run it
+on a small dedicated thread pool instead of the event loop. bcrypt releases the
+GIL while hashing, which lets ``PASSWORD_HASH_MAX_WORKERS`` logins hash in
+parallel; further logins queue for a free worker rather than stalling other
+requests or starving Starlette's shared threadpool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import bcrypt
+
+from app.core.config import settings
+
+
+def hash_password(password: str, rounds: int | None = None) -> str:
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode(), salt).decode()
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode(), hashed.encode())
+    except ValueError:
+        # Malformed or non-bcrypt hash stored for this user
+        return False
+
+
+def hash_rounds(hashed: str) -> int | None:
+    """Cost factor encoded in a ``$2b$<cost>$...`` hash."""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed: str) -> bool:
+    return hash_rounds(hashed) != settings.BCRYPT_ROUNDS
+
+
+@lru_cache()
+def get_password_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=max(settings.PASSWORD_HASH_MAX_WORKERS, 1),
+        thread_name_prefix="password-hash",
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_executor(), hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_executor(), verify_password, password, hashed)
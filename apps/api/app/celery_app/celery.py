@@ -1,14 +1,21 @@
 """Celery application factory."""
 
+import logging
+
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.core.config import settings
+from app.core.database import sync_engine
+from app.core.pool_metrics import pool_metrics
+
+logger = logging.getLogger(__name__)
 
 
 celery_app = Celery(
     "ai_handwritten",
-    broker=settings.REDIS_URL,
-    backend=settings.REDIS_URL,
+    broker=str(settings.REDIS_URL),
+    backend=str(settings.REDIS_URL),
 )
 
 celery_app.conf.update(
@@ -22,7 +29,24 @@ celery_app.conf.update(
 )
 
 
+@worker_process_init.connect
+def _reset_db_pool(**_: object) -> None:
+    # Forked children must not reuse sockets the parent may have opened
+    sync_engine.dispose(close=False)
+
+
+@worker_process_shutdown.connect
+def _log_db_pool(**_: object) -> None:
+    logger.info("Worker DB pool at shutdown: %s", pool_metrics(sync_engine.pool))
+
+
 @celery_app.task(name="app.celery.health_check")
 def health_check() -> str:
     return "healthy"
 
+
+@celery_app.task(name="app.celery.db_pool_stats")
+def db_pool_stats() -> dict:
+    """Checkout latency and saturation of the worker process that runs this task."""
+    return pool_metrics(sync_engine.pool)
+
@@ -1,24 +1,61 @@
 """Database session management."""
 
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.core.pool_metrics import async_pool_class, sync_pool_class
 
 
-async_engine = create_async_engine(str(settings.DATABASE_URL), future=True, echo=False)
+def _pool_options(url: str, pool_class: type, pool_size: int, max_overflow: int) -> dict[str, Any]:
+    # SQLite (local dev/tests) keeps SQLAlchemy's default pool
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": pool_class,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+# The API serves requests from the async engine; Celery workers only touch the sync
+# engine, so each process type opens connections from its own separately sized pool.
+async_engine = create_async_engine(
+    str(settings.DATABASE_URL),
+    future=True,
+    echo=False,
+    **_pool_options(str(settings.DATABASE_URL), async_pool_class("api"), settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+)
 async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
 
-sync_engine = create_engine(str(settings.SYNC_DATABASE_URL), future=True, echo=False)
+sync_engine = create_engine(
+    str(settings.SYNC_DATABASE_URL),
+    future=True,
+    echo=False,
+    **_pool_options(
+        str(settings.SYNC_DATABASE_URL),
+        sync_pool_class("worker"),
+        settings.WORKER_DB_POOL_SIZE,
+        settings.WORKER_DB_MAX_OVERFLOW,
+    ),
+)
 sync_session_factory = sessionmaker(bind=sync_engine, expire_on_commit=False, class_=Session)
 
 Base = declarative_base()
 
 
 async def init_db() -> None:
+    """Create all tables directly; only for throwaway dev/test databases.
+
+    Real deployments are migrated with Alembic (``alembic upgrade head``).
+    """
     from app import models
 
     async with async_engine.begin() as conn:
@@ -26,6 +63,7 @@ async def init_db() -> None:
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """One session per request; uncommitted work is rolled back when it closes."""
     async with async_session_factory() as session:
         yield session
 
@@ -0,0 +1,116 @@
+"""Connection-pool checkout latency and saturation metrics.
+
+Each engine gets a ``QueuePool`` subclass that times ``connect()``, i.e. how
+long a request or task waited for a connection, including pre-ping and any
+new connection opened as overflow. Stats are per process: every API replica
+and every Celery worker process holds its own pool, so Postgres must allow
+``replicas * (DB_POOL_SIZE + DB_MAX_OVERFLOW)`` plus
+``worker processes * (WORKER_DB_POOL_SIZE + WORKER_DB_MAX_OVERFLOW)``.
+"""
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Checkout latencies kept for percentiles
+RECENT_SAMPLES = 1024
+
+
+class PoolStats:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.peak_checked_out = 0
+        self.recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, checked_out: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.recent.append(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        with self._lock:
+            recent = sorted(self.recent)
+            checkouts, timeouts = self.checkouts, self.timeouts
+            wait_total, wait_max, peak = self.wait_seconds_total, self.wait_seconds_max, self.peak_checked_out
+
+        def pct(p: int) -> float | None:
+            if not recent:
+                return None
+            if len(recent) == 1:
+                return recent[0] * 1000
+            return statistics.quantiles(recent, n=100, method="inclusive")[p - 1] * 1000
+
+        size = pool.size() if isinstance(pool, QueuePool) else None
+        max_overflow = getattr(pool, "_max_overflow", None)
+        capacity = size + max_overflow if size is not None and max_overflow is not None and max_overflow >= 0 else None
+        checked_out = pool.checkedout() if isinstance(pool, QueuePool) else None
+        return {
+            "pool": self.name,
+            "size": size,
+            "max_overflow": max_overflow,
+            "capacity": capacity,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin() if isinstance(pool, QueuePool) else None,
+            "overflow": pool.overflow() if isinstance(pool, QueuePool) else None,
+            "saturation": round(checked_out / capacity, 3) if capacity and checked_out is not None else None,
+            "peak_checked_out": peak,
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "checkout_ms_avg": wait_total / checkouts * 1000 if checkouts else None,
+            "checkout_ms_p50": pct(50),
+            "checkout_ms_p95": pct(95),
+            "checkout_ms_p99": pct(99),
+            "checkout_ms_max": wait_max * 1000 if checkouts else None,
+        }
+
+
+def instrumented_pool_class(base: type[QueuePool], stats: PoolStats) -> type[QueuePool]:
+    """``base`` with checkout timing; the stats live on the class so they
+    survive ``Pool.recreate()`` after ``engine.dispose()``."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = base.connect(self)
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record(time.perf_counter() - start, self.checkedout())
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"stats": stats, "connect": connect})
+
+
+def sync_pool_class(name: str) -> type[QueuePool]:
+    return instrumented_pool_class(QueuePool, PoolStats(name))
+
+
+def async_pool_class(name: str) -> type[QueuePool]:
+    return instrumented_pool_class(AsyncAdaptedQueuePool, PoolStats(name))
+
+
+def pool_metrics(pool: Pool) -> dict[str, Any]:
+    stats: PoolStats | None = getattr(pool, "stats", None)
+    if stats is None:
+        # e.g. SQLite, which keeps SQLAlchemy's default pool
+        return {"pool": type(pool).__name__, "status": pool.status()}
+    return stats.snapshot(pool)
@@ -0,0 +1,36 @@
+"""Shared Redis client used for caching and progress tracking."""
+
+from __future__ import annotations
+
+import functools
+import logging
+from typing import Any
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None  # type: ignore
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def get_redis() -> Any | None:
+    """Return a process-wide Redis client, or ``None`` when Redis is unavailable."""
+    if redis is None:  # pragma: no cover
+        logger.warning("redis package not installed; Redis-backed features disabled")
+        return None
+    return redis.Redis.from_url(str(settings.REDIS_URL), socket_timeout=2, socket_connect_timeout=2)
+
+
+@functools.lru_cache(maxsize=1)
+def get_async_redis() -> Any | None:
+    """Return a process-wide asyncio Redis client for use inside API handlers."""
+    if redis is None:  # pragma: no cover
+        logger.warning("redis package not installed; Redis-backed features disabled")
+        return None
+    import redis.asyncio as redis_asyncio
+
+    return redis_asyncio.Redis.from_url(str(settings.REDIS_URL), socket_timeout=2, socket_connect_timeout=2)
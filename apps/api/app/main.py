@@ -7,11 +7,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import analytics, auth, batch, feedback, process, results, uploads
+from app.api.routes import analytics, auth, batch, events, feedback, process, results, uploads
 from app.api.routes import submissions
 from app.api.routes.health import router as health_router
 from app.core.config import settings
-from app.core.database import init_db
 
 
 def create_app() -> FastAPI:
@@ -43,14 +42,9 @@ def create_app() -> FastAPI:
     app.include_router(feedback.router, prefix=settings.API_V1_STR, tags=["feedback"])
     app.include_router(analytics.router, prefix=settings.API_V1_STR, tags=["analytics"])
     app.include_router(batch.router, prefix=settings.API_V1_STR, tags=["batch"])
+    app.include_router(events.router, prefix=settings.API_V1_STR, tags=["events"])
 
-    @app.on_event("startup")
-    async def startup_event() -> None:
-        try:
-            await init_db()
-        except Exception as e:
-            print(f"Warning: Database initialization failed: {e}")
-            print("Continuing with server startup...")
+    # Schema changes are applied with Alembic (`alembic upgrade head`), not on boot
 
     return app
 
@@ -55,3 +55,16 @@ try:
     from .analytics_cache import AnalyticsCache  # type: ignore
 except Exception:  # pragma: no cover
     AnalyticsCache = None  # type: ignore
+
+# Stored objects
+try:
+    from .stored_object import StoredObject  # type: ignore
+except Exception:  # pragma: no cover
+    StoredObject = None  # type: ignore
+
+# Analytics aggregates
+try:
+    from .analytics_aggregate import AnalyticsAggregate, AnalyticsKeywordMiss  # type: ignore
+except Exception:  # pragma: no cover
+    AnalyticsAggregate = None  # type: ignore
+    AnalyticsKeywordMiss = None  # type: ignore
@@ -0,0 +1,30 @@
+"""Incrementally maintained analytics aggregates."""
+
+from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class AnalyticsAggregate(Base):
+    """Running evaluation totals for one scope: ``global`` or ``exam:<id>``."""
+
+    __tablename__ = "analytics_aggregates"
+
+    scope = Column(String, primary_key=True)
+    evaluation_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    confidence_low = Column(Integer, nullable=False, default=0)
+    confidence_medium = Column(Integer, nullable=False, default=0)
+    confidence_high = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class AnalyticsKeywordMiss(Base):
+    """How many evaluations in a scope listed ``keyword`` as missing."""
+
+    __tablename__ = "analytics_keyword_misses"
+
+    scope = Column(String, primary_key=True)
+    keyword = Column(String, primary_key=True)
+    miss_count = Column(Integer, nullable=False, default=0)
@@ -13,6 +13,9 @@ class AnalyticsCache(Base):
     key = Column(String, unique=True, nullable=False)
     payload = Column(JSON, default=dict)
     computed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    # Invalidation generation of the scope at compute time; a newer one marks the entry stale
+    generation = Column(Integer, nullable=True)
 
 
 
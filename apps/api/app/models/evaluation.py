@@ -1,6 +1,6 @@
 """Evaluation model."""
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, JSON, String, Text, UniqueConstraint, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -9,6 +9,7 @@ from app.core.database import Base
 
 class Evaluation(Base):
     __tablename__ = "evaluations"
+    __table_args__ = (UniqueConstraint("submission_id", name="uq_evaluations_submission_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False)
@@ -25,4 +26,22 @@ class Evaluation(Base):
     submission = relationship("Submission", back_populates="evaluation")
 
 
+@event.listens_for(Evaluation, "after_insert")
+def _aggregate_inserted_evaluation(mapper, connection, target: Evaluation) -> None:
+    from app.services.analytics_aggregate_service import record_evaluation_write
 
+    record_evaluation_write(connection, target, old=False, new=True)
+
+
+@event.listens_for(Evaluation, "after_update")
+def _aggregate_updated_evaluation(mapper, connection, target: Evaluation) -> None:
+    from app.services.analytics_aggregate_service import record_evaluation_write
+
+    record_evaluation_write(connection, target, old=True, new=True)
+
+
+@event.listens_for(Evaluation, "after_delete")
+def _aggregate_deleted_evaluation(mapper, connection, target: Evaluation) -> None:
+    from app.services.analytics_aggregate_service import record_evaluation_write
+
+    record_evaluation_write(connection, target, old=True, new=False)
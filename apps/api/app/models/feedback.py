@@ -10,7 +10,7 @@ class Feedback(Base):
     __tablename__ = "feedback"
 
     id = Column(Integer, primary_key=True, index=True)
-    evaluation_id = Column(Integer, ForeignKey("evaluations.id"), nullable=False)
+    evaluation_id = Column(Integer, ForeignKey("evaluations.id"), nullable=False, index=True)
     teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     comments = Column(String, nullable=True)
     suggested_score = Column(Float, nullable=True)
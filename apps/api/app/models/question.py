@@ -1,6 +1,6 @@
 """Question model."""
 
-from sqlalchemy import Column, ForeignKey, Integer, JSON, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, JSON, LargeBinary, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -8,6 +8,7 @@ from app.core.database import Base
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (Index("ix_questions_exam_id_id", "exam_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     exam_id = Column(Integer, ForeignKey("exams.id"), nullable=False)
@@ -17,10 +18,9 @@ class Question(Base):
     keywords = Column(JSON, default=list)
     model_answer = Column(String, nullable=True)
     marks = Column(Integer, default=5)
+    # float32 embedding of model_answer, tagged with the model and answer text that produced it
+    model_answer_embedding = Column(LargeBinary, nullable=True)
+    embedding_version = Column(String, nullable=True)
 
     exam = relationship("Exam", backref="questions")
 
-
-
-
-
@@ -0,0 +1,16 @@
+"""Content-addressed stored object model."""
+
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class StoredObject(Base):
+    __tablename__ = "stored_objects"
+
+    sha256 = Column(String(64), primary_key=True)
+    storage_path = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
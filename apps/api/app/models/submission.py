@@ -1,6 +1,6 @@
 """Submission model."""
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -9,11 +9,18 @@ from app.core.database import Base
 
 class Submission(Base):
     __tablename__ = "submissions"
+    __table_args__ = (
+        # Keyset-paginated listing per user
+        Index("ix_submissions_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_submissions_status", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     exam_id = Column(Integer, ForeignKey("exams.id"), nullable=False)
     storage_path = Column(String, nullable=False)
+    content_hash = Column(String(64), ForeignKey("stored_objects.sha256"), nullable=True, index=True)
+    duplicate_of_id = Column(Integer, ForeignKey("submissions.id"), nullable=True)
     status = Column(String, default="uploaded")
     language = Column(String, default="en")
     ocr_confidence = Column(Float, nullable=True)
@@ -1,6 +1,8 @@
 """Analytics cache repository."""
 
-from sqlalchemy import select
+import datetime as dt
+
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import AnalyticsCache
@@ -11,22 +13,33 @@ class AnalyticsCacheRepository(BaseRepository):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
 
-    async def get(self, key: str) -> AnalyticsCache | None:
-        result = await self.session.execute(select(AnalyticsCache).where(AnalyticsCache.key == key))
+    async def get(self, key: str, reload: bool = False) -> AnalyticsCache | None:
+        stmt = select(AnalyticsCache).where(AnalyticsCache.key == key)
+        if reload:
+            # Overwrite an instance already in the identity map with the current row
+            stmt = stmt.execution_options(populate_existing=True)
+        result = await self.session.execute(stmt)
         return result.scalars().first()
 
-    async def upsert(self, key: str, payload: dict) -> AnalyticsCache:
+    async def upsert(
+        self, key: str, payload: dict, ttl_seconds: int | None = None, generation: int | None = None
+    ) -> AnalyticsCache:
+        now = dt.datetime.now(dt.timezone.utc)
+        expires_at = now + dt.timedelta(seconds=ttl_seconds) if ttl_seconds is not None else None
         cache = await self.get(key)
         if cache is None:
             cache = AnalyticsCache(key=key, payload=payload)
             self.session.add(cache)
         else:
             cache.payload = payload
+        cache.computed_at = now
+        cache.expires_at = expires_at
+        cache.generation = generation
         await self.session.commit()
         await self.session.refresh(cache)
         return cache
 
-
-
-
-
+    async def prune(self, computed_before: dt.datetime) -> int:
+        result = await self.session.execute(delete(AnalyticsCache).where(AnalyticsCache.computed_at < computed_before))
+        await self.session.commit()
+        return result.rowcount
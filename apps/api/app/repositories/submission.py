@@ -1,12 +1,31 @@
 """Submission repository."""
 
-from sqlalchemy import select
+import base64
+import binascii
+import datetime as dt
+
+from sqlalchemy import Row, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Submission
+from app.models import Evaluation, Submission
 from app.repositories.base import BaseRepository
 
 
+def encode_cursor(created_at: dt.datetime, submission_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{submission_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[dt.datetime, int]:
+    """Inverse of ``encode_cursor``; raises ValueError on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, submission_id = raw.rsplit("|", 1)
+        return dt.datetime.fromisoformat(created_at), int(submission_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
 class SubmissionRepository(BaseRepository):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
@@ -15,13 +34,71 @@ class SubmissionRepository(BaseRepository):
         result = await self.session.execute(select(Submission).where(Submission.id == submission_id))
         return result.scalars().first()
 
+    async def owned_ids(self, user_id: int, exam_id: int, submission_ids: list[int]) -> set[int]:
+        """The subset of ``submission_ids`` that belong to ``user_id`` and ``exam_id``."""
+        result = await self.session.execute(
+            select(Submission.id).where(
+                Submission.id.in_(submission_ids),
+                Submission.user_id == user_id,
+                Submission.exam_id == exam_id,
+            )
+        )
+        return set(result.scalars().all())
+
     async def create(self, submission: Submission) -> Submission:
         self.session.add(submission)
         await self.session.commit()
         await self.session.refresh(submission)
         return submission
 
+    async def list_page_for_user(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: tuple[dt.datetime, int] | None = None,
+        status: str | None = None,
+    ) -> list[Row]:
+        """One page of a user's submissions joined to their evaluation scores.
 
+        Rows are ordered newest first on ``(created_at, id)`` and only the listed
+        columns are loaded. Pass the last row's ``(created_at, id)`` as ``cursor``
+        to continue after it. Fetches ``limit + 1`` rows so callers can tell
+        whether another page exists.
+        """
+        stmt = (
+            select(
+                Submission.id,
+                Submission.exam_id,
+                Submission.status,
+                Submission.storage_path,
+                Submission.created_at,
+                Evaluation.id.label("evaluation_id"),
+                Evaluation.final_score,
+                Evaluation.confidence,
+            )
+            .outerjoin(Evaluation, Evaluation.submission_id == Submission.id)
+            .where(Submission.user_id == user_id)
+            .order_by(Submission.created_at.desc(), Submission.id.desc())
+            .limit(limit + 1)
+        )
+        if status is not None:
+            stmt = stmt.where(Submission.status == status)
+        if cursor is not None:
+            stmt = stmt.where(tuple_(Submission.created_at, Submission.id) < tuple_(*cursor))
+        result = await self.session.execute(stmt)
+        return list(result.all())
 
-
-
+    async def counts_for_user(self, user_id: int) -> dict:
+        """Totals for a user's dashboard: all submissions, evaluated ones and a per-status breakdown."""
+        stmt = (
+            select(Submission.status, func.count(Submission.id), func.count(Evaluation.id))
+            .outerjoin(Evaluation, Evaluation.submission_id == Submission.id)
+            .where(Submission.user_id == user_id)
+            .group_by(Submission.status)
+        )
+        by_status: dict[str, int] = {}
+        evaluated = 0
+        for status, submissions, evaluations in (await self.session.execute(stmt)).all():
+            by_status[status] = submissions
+            evaluated += evaluations
+        return {"total": sum(by_status.values()), "evaluated": evaluated, "by_status": by_status}
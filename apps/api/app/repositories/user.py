@@ -21,6 +21,11 @@ class UserRepository(BaseRepository):
         await self.session.refresh(user)
         return user
 
+    async def update(self, user: User) -> User:
+        await self.session.commit()
+        await self.session.refresh(user)
+        return user
+
 
 
 
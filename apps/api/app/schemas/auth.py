@@ -14,6 +14,8 @@ class Token(BaseModel):
 class TokenPayload(BaseModel):
     sub: str | None = None
     exp: datetime | None = None
+    role: str | None = None
+    is_active: bool = True
 
 
 class UserBase(BaseModel):
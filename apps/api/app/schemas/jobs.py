@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class JobStatus(BaseModel):
@@ -15,7 +15,8 @@ class JobStatus(BaseModel):
 
 class BatchRequest(BaseModel):
     exam_id: int
-    files: list[str]
+    # Submissions created through POST /uploads for this exam
+    submission_ids: list[int] = Field(min_length=1)
 
 
 
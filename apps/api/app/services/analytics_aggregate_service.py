@@ -0,0 +1,200 @@
+"""Running analytics totals kept in step with evaluation writes."""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Connection, Table, and_, delete, func, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import AnalyticsAggregate, AnalyticsKeywordMiss, Evaluation, Submission
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "global"
+
+# Same thresholds the overview has always used
+LOW_CONFIDENCE = 0.6
+HIGH_CONFIDENCE = 0.8
+
+
+def exam_scope(exam_id: int) -> str:
+    return f"exam:{exam_id}"
+
+
+def confidence_bucket(confidence: float | None) -> str:
+    confidence = confidence or 0.0
+    if confidence < LOW_CONFIDENCE:
+        return "low"
+    if confidence < HIGH_CONFIDENCE:
+        return "medium"
+    return "high"
+
+
+def missing_keywords(score_breakdown: dict | None) -> list[str]:
+    if not score_breakdown:
+        return []
+    return list((score_breakdown.get("scoring") or {}).get("missing_keywords") or [])
+
+
+@dataclass
+class AggregateDelta:
+    """Signed change to apply to a scope's running totals."""
+
+    count: int = 0
+    score_sum: float = 0.0
+    buckets: Counter = field(default_factory=Counter)
+    keywords: Counter = field(default_factory=Counter)
+
+    def add(self, final_score: float | None, confidence: float | None, score_breakdown: dict | None, sign: int = 1) -> None:
+        self.count += sign
+        self.score_sum += sign * (final_score or 0.0)
+        self.buckets[confidence_bucket(confidence)] += sign
+        for keyword in missing_keywords(score_breakdown):
+            self.keywords[keyword] += sign
+
+    @property
+    def is_empty(self) -> bool:
+        return (
+            not self.count
+            and not self.score_sum
+            and not any(self.buckets.values())
+            and not any(self.keywords.values())
+        )
+
+
+def _upsert_insert_for(connection: Connection):
+    """The dialect's ``INSERT ... ON CONFLICT`` construct, or ``None`` if it has none."""
+    if connection.dialect.name == "postgresql":
+        return postgresql.insert
+    if connection.dialect.name == "sqlite":
+        return sqlite.insert
+    return None
+
+
+def _increment_rows(connection: Connection, table: Table, keys: list[str], rows: list[dict], counters: list[str]) -> None:
+    """Add each row's ``counters`` to the row matching its ``keys``, inserting it when absent.
+
+    Uses ``INSERT ... ON CONFLICT DO UPDATE`` where the dialect supports it so
+    concurrent writers adjust the counters atomically. Elsewhere each row is an
+    in-place ``UPDATE`` followed by an ``INSERT`` when nothing matched.
+    """
+    extra = {"updated_at": func.now()} if "updated_at" in table.c else {}
+    upsert_insert = _upsert_insert_for(connection)
+    if upsert_insert is not None:
+        stmt = upsert_insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[key] for key in keys],
+            set_={**{name: table.c[name] + stmt.excluded[name] for name in counters}, **extra},
+        )
+        connection.execute(stmt)
+        return
+
+    for row in rows:
+        match = and_(*(table.c[key] == row[key] for key in keys))
+        result = connection.execute(
+            update(table).where(match).values({**{name: table.c[name] + row[name] for name in counters}, **extra})
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(row))
+
+
+def apply_aggregate_delta(connection: Connection, exam_id: int | None, delta: AggregateDelta) -> None:
+    """Add ``delta`` to the global totals and to ``exam_id``'s totals."""
+    if delta.is_empty:
+        return
+    scopes = [GLOBAL_SCOPE] + ([exam_scope(exam_id)] if exam_id is not None else [])
+
+    increments = {
+        "evaluation_count": delta.count,
+        "score_sum": delta.score_sum,
+        "confidence_low": delta.buckets["low"],
+        "confidence_medium": delta.buckets["medium"],
+        "confidence_high": delta.buckets["high"],
+    }
+    _increment_rows(
+        connection,
+        AnalyticsAggregate.__table__,
+        ["scope"],
+        [{"scope": scope, **increments} for scope in scopes],
+        list(increments),
+    )
+
+    keyword_rows = [
+        {"scope": scope, "keyword": keyword, "miss_count": change}
+        for scope in scopes
+        for keyword, change in delta.keywords.items()
+        if change
+    ]
+    if keyword_rows:
+        _increment_rows(connection, AnalyticsKeywordMiss.__table__, ["scope", "keyword"], keyword_rows, ["miss_count"])
+
+
+def submission_exam_id(connection: Connection, submission_id: int) -> int | None:
+    return connection.execute(select(Submission.exam_id).where(Submission.id == submission_id)).scalar()
+
+
+def rebuild_aggregates(connection: Connection, chunk_size: int = 1000) -> int:
+    """Recompute every aggregate from the evaluations table; returns rows scanned.
+
+    Used to backfill after the tables are created and to repair drift after
+    writes that bypassed the ORM (raw SQL, manual fixes).
+    """
+    connection.execute(delete(AnalyticsKeywordMiss))
+    connection.execute(delete(AnalyticsAggregate))
+
+    per_exam: dict[int | None, AggregateDelta] = {}
+    scanned = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(
+                Evaluation.id,
+                Evaluation.final_score,
+                Evaluation.confidence,
+                Evaluation.score_breakdown,
+                Submission.exam_id,
+            )
+            .join(Submission, Submission.id == Evaluation.submission_id)
+            .where(Evaluation.id > last_id)
+            .order_by(Evaluation.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        scanned += len(rows)
+        for row in rows:
+            per_exam.setdefault(row.exam_id, AggregateDelta()).add(row.final_score, row.confidence, row.score_breakdown)
+
+    for exam_id, delta in per_exam.items():
+        apply_aggregate_delta(connection, exam_id, delta)
+    logger.info("Rebuilt analytics aggregates from %d evaluations", scanned)
+    return scanned
+
+
+def _previous_value(target: Any, attr: str) -> Any:
+    history = inspect(target).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attr)
+
+
+def record_evaluation_write(connection: Connection, target: Evaluation, old: bool, new: bool) -> None:
+    """Mapper-event hook: move ``target``'s contribution from its old to new values."""
+    delta = AggregateDelta()
+    if old:
+        delta.add(
+            _previous_value(target, "final_score"),
+            _previous_value(target, "confidence"),
+            _previous_value(target, "score_breakdown"),
+            sign=-1,
+        )
+    if new:
+        delta.add(target.final_score, target.confidence, target.score_breakdown)
+    if delta.is_empty:
+        return
+    apply_aggregate_delta(connection, submission_exam_id(connection, target.submission_id), delta)
@@ -0,0 +1,233 @@
+"""Stale-while-revalidate caching of analytics payloads in ``analytics_cache``.
+
+Entries are fresh for ``ANALYTICS_CACHE_TTL_SECONDS`` and for as long as their
+scope's invalidation generation is unchanged. Evaluation and feedback writes
+bump that generation in Redis and emit an ``events:analytics`` event. A stale
+entry is still served for up to ``ANALYTICS_CACHE_STALE_SECONDS`` while one
+background refresh recomputes it. Recomputation of a key is single-flight:
+callers in the same process share one task, and a Redis lock keeps other API
+processes from repeating the same scan. A process that loses the lock keeps
+serving its stale entry; with nothing to serve it polls for the winner's
+result with exponential backoff.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.redis import get_async_redis, get_redis
+from app.models import AnalyticsCache
+from app.repositories.analytics_cache import AnalyticsCacheRepository
+from app.services.analytics_aggregate_service import GLOBAL_SCOPE, exam_scope
+from app.services.event_service import publish_event, publish_event_async
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_CHANNEL = "events:analytics"
+
+Compute = Callable[[AsyncSession], Awaitable[dict]]
+
+# Compare-and-delete so a lock that expired and was re-taken is left alone
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Backoff while another process recomputes an entry this one has nothing to serve for
+_POLL_INITIAL_SECONDS = 0.05
+_POLL_MAX_SECONDS = 1.0
+
+_inflight: dict[str, asyncio.Task] = {}
+
+
+def _generation_key(scope: str) -> str:
+    return f"analytics:generation:{scope}"
+
+
+def _lock_key(key: str) -> str:
+    return f"analytics:lock:{key}"
+
+
+def _invalidated_scopes(exam_id: int | None) -> list[str]:
+    return [GLOBAL_SCOPE] + ([exam_scope(exam_id)] if exam_id is not None else [])
+
+
+def invalidate_analytics(exam_id: int | None = None) -> None:
+    """Mark cached analytics for ``exam_id`` (and the global scope) stale."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline()
+        for scope in _invalidated_scopes(exam_id):
+            pipe.incr(_generation_key(scope))
+        pipe.execute()
+    except Exception as exc:  # pragma: no cover - invalidation is best effort
+        logger.warning("Failed to invalidate analytics cache: %s", exc)
+        return
+    publish_event(ANALYTICS_CHANNEL, "analytics", "invalidated", exam_id=exam_id)
+
+
+async def invalidate_analytics_async(exam_id: int | None = None) -> None:
+    """Async variant of :func:`invalidate_analytics` for API handlers."""
+    client = get_async_redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline()
+        for scope in _invalidated_scopes(exam_id):
+            pipe.incr(_generation_key(scope))
+        await pipe.execute()
+    except Exception as exc:  # pragma: no cover - invalidation is best effort
+        logger.warning("Failed to invalidate analytics cache: %s", exc)
+        return
+    await publish_event_async(ANALYTICS_CHANNEL, "analytics", "invalidated", exam_id=exam_id)
+
+
+async def current_generation(scope: str) -> int | None:
+    """The scope's invalidation generation, or ``None`` when Redis is unavailable."""
+    client = get_async_redis()
+    if client is None:
+        return None
+    try:
+        value = await client.get(_generation_key(scope))
+    except Exception as exc:  # pragma: no cover
+        logger.warning("Failed to read analytics generation: %s", exc)
+        return None
+    return int(value or 0)
+
+
+def _as_utc(value: dt.datetime | None) -> dt.datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=dt.timezone.utc)
+    return value
+
+
+def _freshness(entry: AnalyticsCache, generation: int | None) -> str:
+    """Classify an entry as ``fresh``, ``stale`` (servable) or ``expired``."""
+    now = dt.datetime.now(dt.timezone.utc)
+    expires_at = _as_utc(entry.expires_at)
+    if expires_at is None:
+        return "expired"
+    invalidated = generation is not None and entry.generation != generation
+    if now < expires_at and not invalidated:
+        return "fresh"
+    if now < expires_at + dt.timedelta(seconds=settings.ANALYTICS_CACHE_STALE_SECONDS):
+        return "stale"
+    return "expired"
+
+
+async def _acquire_lock(key: str) -> tuple[bool, str | None]:
+    client = get_async_redis()
+    if client is None:
+        return True, None
+    token = uuid.uuid4().hex
+    try:
+        acquired = await client.set(_lock_key(key), token, nx=True, ex=settings.ANALYTICS_CACHE_LOCK_SECONDS)
+    except Exception as exc:  # pragma: no cover - fall back to computing locally
+        logger.warning("Analytics refresh lock unavailable: %s", exc)
+        return True, None
+    return bool(acquired), token
+
+
+async def _release_lock(key: str, token: str | None) -> None:
+    client = get_async_redis()
+    if client is None or token is None:
+        return
+    try:
+        await client.eval(_RELEASE_LOCK_SCRIPT, 1, _lock_key(key), token)
+    except Exception as exc:  # pragma: no cover - the lock expires on its own
+        logger.warning("Failed to release analytics refresh lock: %s", exc)
+
+
+async def _recompute(key: str, scope: str, compute: Compute, force: bool = False) -> dict | None:
+    """Recompute and store ``key``; ``None`` if another process holds its lock."""
+    acquired, token = await _acquire_lock(key)
+    if not acquired and not force:
+        return None
+    try:
+        # Read the generation first so writes that land mid-scan leave the entry stale
+        generation = await current_generation(scope)
+        async with async_session_factory() as session:
+            payload = await compute(session)
+            repo = AnalyticsCacheRepository(session)
+            await repo.upsert(key, payload, ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS, generation=generation)
+            horizon = settings.ANALYTICS_CACHE_TTL_SECONDS + settings.ANALYTICS_CACHE_STALE_SECONDS
+            await repo.prune(dt.datetime.now(dt.timezone.utc) - dt.timedelta(seconds=horizon))
+        return payload
+    finally:
+        if acquired:
+            await _release_lock(key, token)
+
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background analytics refresh failed: %s", task.exception())
+
+
+def _refresh(key: str, scope: str, compute: Compute, force: bool = False) -> asyncio.Task:
+    """Start, or join, the single in-process recomputation of ``key``."""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_recompute(key, scope, compute, force))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+        task.add_done_callback(_log_refresh_failure)
+    return task
+
+
+class AnalyticsCacheService:
+    def __init__(self, session: AsyncSession) -> None:
+        self.repo = AnalyticsCacheRepository(session)
+
+    async def get_or_compute(self, key: str, scope: str, compute: Compute) -> dict:
+        """Return the cached payload for ``key``, computing it at most once at a time.
+
+        ``compute`` receives its own session because background refreshes outlive
+        the request that triggered them.
+        """
+        entry = await self.repo.get(key)
+        previous = None
+        if entry is not None and entry.payload:
+            previous = _as_utc(entry.computed_at)
+            state = _freshness(entry, await current_generation(scope))
+            if state == "fresh":
+                return entry.payload
+            if state == "stale":
+                # If another process holds the lock it is already refreshing the entry
+                _refresh(key, scope, compute)
+                return entry.payload
+        payload = await asyncio.shield(_refresh(key, scope, compute))
+        if payload is None:
+            payload = await self._wait_for_refresh(key, previous)
+        if payload is None:
+            logger.info("Timed out waiting for analytics refresh of %s; computing locally", key)
+            payload = await asyncio.shield(_refresh(key, scope, compute, force=True))
+        if payload is None:
+            # Joined a refresh that lost the lock again before the forced one started
+            payload = await _recompute(key, scope, compute, force=True)
+        return payload
+
+    async def _wait_for_refresh(self, key: str, previous: dt.datetime | None) -> dict | None:
+        """Poll, on the caller's session and with backoff, for another process's
+        recomputation of ``key`` to land."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.ANALYTICS_CACHE_LOCK_SECONDS
+        delay = _POLL_INITIAL_SECONDS
+        while (remaining := deadline - loop.time()) > 0:
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, _POLL_MAX_SECONDS)
+            entry = await self.repo.get(key, reload=True)
+            if entry is not None and entry.payload and _as_utc(entry.computed_at) != previous:
+                return entry.payload
+        return None
@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import datetime as dt
 import logging
-from collections import Counter
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, case, cast, func, literal, select, true
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Evaluation, Submission
-from app.repositories.analytics_cache import AnalyticsCacheRepository
+from app.models import AnalyticsAggregate, AnalyticsKeywordMiss, Evaluation, Submission
+from app.services.analytics_aggregate_service import GLOBAL_SCOPE, HIGH_CONFIDENCE, LOW_CONFIDENCE, exam_scope
+from app.services.analytics_cache_service import AnalyticsCacheService
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,7 @@ logger = logging.getLogger(__name__)
 class AnalyticsService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
-        self.cache_repo = AnalyticsCacheRepository(session)
+        self.cache = AnalyticsCacheService(session)
 
     @staticmethod
     def _prepare_response(payload: dict) -> dict:
@@ -31,43 +32,132 @@ class AnalyticsService:
                 logger.debug("Unable to parse updated_at %s", updated_at)
         return data
 
-    async def get_overview(self) -> dict:
-        cache = await self.cache_repo.get("overview")
-        if cache and cache.payload:
-            return self._prepare_response(cache.payload)
-
-        scores_stmt = select(func.avg(Evaluation.final_score))
-        confidence_stmt = select(Evaluation.confidence)
-        keyword_gap_stmt = select(Submission.status, func.count(Submission.id)).group_by(Submission.status)
-        evaluation_stmt = select(Evaluation.score_breakdown)
-
-        average_score = (await self.session.execute(scores_stmt)).scalar() or 0.0
-        confidences = [row[0] for row in (await self.session.execute(confidence_stmt)).all()]
-        confidence_distribution = {
-            "low": sum(1 for c in confidences if c < 0.6),
-            "medium": sum(1 for c in confidences if 0.6 <= c < 0.8),
-            "high": sum(1 for c in confidences if c >= 0.8),
-        }
-        status_breakdown = {status: count for status, count in (await self.session.execute(keyword_gap_stmt)).all()}
-
-        missed_counter: Counter[str] = Counter()
-        evaluation_rows = await self.session.execute(evaluation_stmt)
-        for (score_breakdown,) in evaluation_rows:
-            if not score_breakdown:
-                continue
-            scoring = score_breakdown.get("scoring", {})
-            missing_keywords = scoring.get("missing_keywords", [])
-            for keyword in missing_keywords:
-                missed_counter[keyword] += 1
-
-        timestamp = dt.datetime.utcnow().isoformat()
-        payload = {
+    async def get_overview(
+        self,
+        exam_id: int | None = None,
+        since: dt.datetime | None = None,
+        until: dt.datetime | None = None,
+    ) -> dict:
+        """Read the overview from the running aggregates kept by evaluation writes.
+
+        Score and confidence figures are single-row lookups, so the result is
+        always current without scanning evaluations. Time windows are not covered
+        by the aggregates; they are computed in SQL and cached with a TTL.
+        """
+        if since is not None or until is not None:
+            key = "overview:exam={}:since={}:until={}".format(
+                exam_id if exam_id is not None else "all",
+                since.isoformat() if since else "",
+                until.isoformat() if until else "",
+            )
+            scope = exam_scope(exam_id) if exam_id is not None else GLOBAL_SCOPE
+            payload = await self.cache.get_or_compute(
+                key, scope, lambda session: AnalyticsService(session)._compute_window(exam_id, since, until)
+            )
+            return self._prepare_response(payload)
+
+        scope = exam_scope(exam_id) if exam_id is not None else GLOBAL_SCOPE
+        totals = await self.session.get(AnalyticsAggregate, scope)
+
+        keyword_stmt = select(AnalyticsKeywordMiss.keyword, AnalyticsKeywordMiss.miss_count).where(
+            AnalyticsKeywordMiss.scope == scope, AnalyticsKeywordMiss.miss_count > 0
+        )
+        status_stmt = select(Submission.status, func.count(Submission.id)).group_by(Submission.status)
+        if exam_id is not None:
+            status_stmt = status_stmt.where(Submission.exam_id == exam_id)
+
+        missed_keywords = {keyword: count for keyword, count in (await self.session.execute(keyword_stmt)).all()}
+        status_breakdown = {status: count for status, count in (await self.session.execute(status_stmt)).all()}
+
+        if totals is None or not totals.evaluation_count:
+            average_score = 0.0
+            confidence_distribution = {"low": 0, "medium": 0, "high": 0}
+        else:
+            average_score = totals.score_sum / totals.evaluation_count
+            confidence_distribution = {
+                "low": totals.confidence_low,
+                "medium": totals.confidence_medium,
+                "high": totals.confidence_high,
+            }
+
+        return {
             "average_score": average_score,
             "confidence_distribution": confidence_distribution,
-            "missed_keywords": dict(missed_counter),
+            "missed_keywords": missed_keywords,
             "status_breakdown": status_breakdown,
-            "updated_at": timestamp,
+            "updated_at": (totals.updated_at if totals is not None else None) or dt.datetime.utcnow(),
         }
-        await self.cache_repo.upsert("overview", payload)
-        return self._prepare_response(payload)
 
+    @staticmethod
+    def _filtered(stmt: Select, exam_id: int | None, since: dt.datetime | None, until: dt.datetime | None) -> Select:
+        if exam_id is not None:
+            stmt = stmt.join(Submission, Submission.id == Evaluation.submission_id).where(Submission.exam_id == exam_id)
+        if since is not None:
+            stmt = stmt.where(Evaluation.created_at >= since)
+        if until is not None:
+            stmt = stmt.where(Evaluation.created_at < until)
+        return stmt
+
+    def _missing_keyword_elements(self):
+        """Table-valued function expanding each row's ``scoring.missing_keywords``."""
+        if self.session.get_bind().dialect.name == "sqlite":
+            return func.json_each(Evaluation.score_breakdown, "$.scoring.missing_keywords").table_valued("value")
+        path = func.jsonb_extract_path(cast(Evaluation.score_breakdown, JSONB), "scoring", "missing_keywords")
+        # jsonb_array_elements_text raises on scalars such as JSON null
+        elements = case((func.jsonb_typeof(path) == "array", path), else_=cast(literal("[]"), JSONB))
+        return func.jsonb_array_elements_text(elements).table_valued("value")
+
+    async def _compute_window(
+        self, exam_id: int | None, since: dt.datetime | None, until: dt.datetime | None
+    ) -> dict:
+        """Aggregate a slice of evaluations entirely in the database."""
+        summary_stmt = self._filtered(
+            select(
+                func.avg(Evaluation.final_score),
+                func.sum(case((func.coalesce(Evaluation.confidence, 0.0) < LOW_CONFIDENCE, 1), else_=0)),
+                func.sum(
+                    case(
+                        (
+                            (func.coalesce(Evaluation.confidence, 0.0) >= LOW_CONFIDENCE)
+                            & (Evaluation.confidence < HIGH_CONFIDENCE),
+                            1,
+                        ),
+                        else_=0,
+                    )
+                ),
+                func.sum(case((Evaluation.confidence >= HIGH_CONFIDENCE, 1), else_=0)),
+            ),
+            exam_id,
+            since,
+            until,
+        )
+        average_score, low, medium, high = (await self.session.execute(summary_stmt)).one()
+
+        keyword = self._missing_keyword_elements()
+        keyword_stmt = self._filtered(
+            select(keyword.c.value, func.count())
+            .select_from(Evaluation)
+            .join(keyword, true())
+            .where(keyword.c.value.is_not(None)),
+            exam_id,
+            since,
+            until,
+        ).group_by(keyword.c.value)
+        missed_keywords = {value: count for value, count in (await self.session.execute(keyword_stmt)).all()}
+
+        status_stmt = select(Submission.status, func.count(Submission.id)).group_by(Submission.status)
+        if exam_id is not None:
+            status_stmt = status_stmt.where(Submission.exam_id == exam_id)
+        if since is not None:
+            status_stmt = status_stmt.where(Submission.created_at >= since)
+        if until is not None:
+            status_stmt = status_stmt.where(Submission.created_at < until)
+        status_breakdown = {status: count for status, count in (await self.session.execute(status_stmt)).all()}
+
+        return {
+            "average_score": average_score or 0.0,
+            "confidence_distribution": {"low": low or 0, "medium": medium or 0, "high": high or 0},
+            "missed_keywords": missed_keywords,
+            "status_breakdown": status_breakdown,
+            "updated_at": dt.datetime.utcnow().isoformat(),
+        }
@@ -1,7 +1,6 @@
 """Service for authentication and user management."""
 
-import bcrypt
-
+from app.auth.passwords import hash_password_async, needs_rehash, verify_password_async
 from app.models import User
 from app.repositories.user import UserRepository
 from app.schemas.auth import UserCreate
@@ -15,7 +14,7 @@ class AuthService:
         existing = await self.repo.get_by_email(payload.email)
         if existing:
             raise ValueError("User already exists")
-        hashed = bcrypt.hashpw(payload.password.encode(), bcrypt.gensalt()).decode()
+        hashed = await hash_password_async(payload.password)
         user = User(email=payload.email, full_name=payload.full_name, hashed_password=hashed)
         return await self.repo.create(user)
 
@@ -23,11 +22,10 @@ class AuthService:
         user = await self.repo.get_by_email(email)
         if not user:
             return None
-        if not bcrypt.checkpw(password.encode(), user.hashed_password.encode()):
+        if not await verify_password_async(password, user.hashed_password):
             return None
+        if needs_rehash(user.hashed_password):
+            # Move the stored hash to the configured cost now that we have the plaintext
+            user.hashed_password = await hash_password_async(password)
+            await self.repo.update(user)
         return user
-
-
-
-
-
@@ -6,15 +6,16 @@ from app.models import Job
 from app.repositories.job import JobRepository
 
 
+def owns_job(job_metadata: dict | None, current_user: dict) -> bool:
+    """Whether ``current_user`` created the batch job with ``job_metadata``."""
+    user_id = (job_metadata or {}).get("user_id")
+    return user_id is not None and str(user_id) == str(current_user["id"])
+
+
 class BatchProcessingService:
     def __init__(self, job_repo: JobRepository) -> None:
         self.job_repo = job_repo
 
     async def create_job(self, job_type: str, metadata: dict | None = None) -> Job:
-        job = Job(job_id=str(uuid.uuid4()), job_type=job_type, metadata=metadata or {})
+        job = Job(job_id=str(uuid.uuid4()), job_type=job_type, job_metadata=metadata or {})
         return await self.job_repo.create(job)
-
-
-
-
-
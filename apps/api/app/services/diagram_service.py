@@ -12,6 +12,8 @@ except Exception:  # pragma: no cover
     cv2 = None  # type: ignore
     np = None  # type: ignore
 
+from app.utils.image import DecodedImage
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,13 +21,13 @@ class DiagramService:
     def __init__(self) -> None:
         self.edge_threshold = 80
 
-    def analyze(self, image_path: str) -> dict[str, Any]:
+    def analyze(self, image: DecodedImage | str) -> dict[str, Any]:
         if cv2 is None or np is None:  # pragma: no cover
             logger.warning("OpenCV not available; returning default diagram analysis")
             return {"has_diagram": False, "edge_density": 0.0, "marks_multiplier": 0.5}
         try:
-            image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-            edges = cv2.Canny(image, self.edge_threshold, self.edge_threshold * 2)
+            gray = DecodedImage.ensure(image).gray
+            edges = cv2.Canny(gray, self.edge_threshold, self.edge_threshold * 2)
             edge_density = float(np.sum(edges) / edges.size)
             has_diagram = edge_density > 0.05
             marks_multiplier = 1.0 if has_diagram else 0.5
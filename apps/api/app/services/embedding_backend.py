@@ -0,0 +1,183 @@
+"""Sentence-embedding backends: PyTorch SentenceTransformer or ONNX Runtime."""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+try:
+    import torch
+except ImportError:  # pragma: no cover
+    torch = None  # type: ignore
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # pragma: no cover
+    SentenceTransformer = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+except Exception:  # pragma: no cover
+    ort = None  # type: ignore
+    AutoTokenizer = None  # type: ignore
+
+from app.core.config import settings
+from app.utils.inference import apply_inference_precision
+
+logger = logging.getLogger(__name__)
+
+ONNX_FILENAME = "model.onnx"
+ENCODER_CONFIG_FILENAME = "encoder.json"
+
+
+def onnx_model_dir(model_name: str) -> Path:
+    """Directory holding the exported ONNX graph and tokenizer for ``model_name``."""
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name)
+    return Path(settings.EMBEDDING_ONNX_DIR) / safe_name
+
+
+class OnnxSentenceEncoder:
+    """ONNX Runtime drop-in for the subset of ``SentenceTransformer.encode`` we use."""
+
+    def __init__(self, model_dir: Path) -> None:
+        config = json.loads((model_dir / ENCODER_CONFIG_FILENAME).read_text(encoding="utf-8"))
+        self.pooling = config.get("pooling", "mean")
+        self.normalize = bool(config.get("normalize", False))
+        self.max_seq_length = int(config.get("max_seq_length", 256))
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_dir / ONNX_FILENAME), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {item.name for item in self.session.get_inputs()}
+
+    def _pool(self, token_embeddings: Any, attention_mask: Any) -> Any:
+        if self.pooling == "cls":
+            return token_embeddings[:, 0]
+        mask = attention_mask[..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(
+        self,
+        sentences: str | Sequence[str],
+        batch_size: int = 32,
+        convert_to_tensor: bool = False,
+        normalize_embeddings: bool = False,
+        **_: Any,
+    ) -> Any:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(
+                texts[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feeds = {name: value.astype(np.int64) for name, value in tokens.items() if name in self.input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+            batches.append(self._pool(token_embeddings, tokens["attention_mask"]))
+
+        width = self.session.get_outputs()[0].shape[-1]
+        embeddings = np.vstack(batches).astype(np.float32) if batches else np.zeros((0, width), dtype=np.float32)
+        if self.normalize or normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+        if single:
+            embeddings = embeddings[0]
+        if convert_to_tensor and torch is not None:
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+
+def export_onnx_encoder(model_name: str, output_dir: Path | None = None) -> Path:
+    """Export ``model_name``'s transformer to ONNX and return the output directory."""
+    if SentenceTransformer is None or torch is None:
+        raise RuntimeError("sentence-transformers and torch are required to export an ONNX encoder")
+
+    from sentence_transformers.models import Normalize, Pooling
+
+    output_dir = output_dir or onnx_model_dir(model_name)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    pooling_module = next((module for module in model if isinstance(module, Pooling)), None)
+    pooling = "cls" if pooling_module is not None and pooling_module.pooling_mode_cls_token else "mean"
+
+    dummy = tokenizer(["export sample"], return_tensors="pt")
+    input_names = list(dummy.keys())
+
+    class _TokenEmbeddings(torch.nn.Module):
+        def __init__(self, inner: Any) -> None:
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, *inputs: Any) -> Any:
+            return self.inner(**dict(zip(input_names, inputs))).last_hidden_state
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            _TokenEmbeddings(transformer),
+            tuple(dummy[name] for name in input_names),
+            str(output_dir / ONNX_FILENAME),
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+
+    tokenizer.save_pretrained(str(output_dir))
+    config = {
+        "model_name": model_name,
+        "pooling": pooling,
+        "normalize": any(isinstance(module, Normalize) for module in model),
+        "max_seq_length": model.max_seq_length,
+    }
+    (output_dir / ENCODER_CONFIG_FILENAME).write_text(json.dumps(config, indent=2), encoding="utf-8")
+    logger.info("Exported ONNX encoder for %s to %s", model_name, output_dir)
+    return output_dir
+
+
+def load_sentence_encoder(model_name: str) -> Any | None:
+    """Load the embedding model, preferring an exported ONNX graph when present."""
+    model_dir = onnx_model_dir(model_name)
+    if settings.EMBEDDING_BACKEND != "torch" and (model_dir / ONNX_FILENAME).exists():
+        if ort is None or np is None:
+            logger.warning("ONNX export found at %s but onnxruntime is not installed", model_dir)
+        else:
+            try:
+                encoder = OnnxSentenceEncoder(model_dir)
+                logger.info("Using ONNX Runtime encoder for %s", model_name)
+                return encoder
+            except Exception as exc:
+                logger.error("Failed to load ONNX encoder from %s: %s", model_dir, exc)
+
+    if SentenceTransformer is None:
+        return None
+    return apply_inference_precision(SentenceTransformer(model_name))
+
+
+def encoder_backend(encoder: Any | None) -> str:
+    """Name of the runtime behind an encoder returned by ``load_sentence_encoder``."""
+    if encoder is None:
+        return "none"
+    return "onnx" if isinstance(encoder, OnnxSentenceEncoder) else "torch"
@@ -0,0 +1,123 @@
+"""Process-wide sentence-embedding engine shared by the scoring services."""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import logging
+import threading
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from app.core.config import settings
+from app.services.embedding_backend import encoder_backend, load_sentence_encoder
+
+logger = logging.getLogger(__name__)
+
+_request_memo: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "embedding_request_memo", default=None
+)
+
+
+class EmbeddingEngine:
+    """Loads one embedding model per process and memoizes encodings per request.
+
+    Wrap a unit of work (e.g. one Celery task) in :meth:`request_scope` so a text
+    that is needed by several services is only encoded once.
+    """
+
+    def __init__(self, model_name: str | None = None) -> None:
+        self.model_name = model_name or settings.SENTENCE_TRANSFORMER_MODEL
+        self._model: Any | None = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> Any | None:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    try:
+                        logger.info("Loading embedding model: %s", self.model_name)
+                        self._model = load_sentence_encoder(self.model_name)
+                    except Exception as exc:
+                        logger.error("Failed to load embedding model %s: %s", self.model_name, exc)
+                        self._model = None
+                    self._loaded = True
+        return self._model
+
+    @property
+    def available(self) -> bool:
+        return self.model is not None and np is not None
+
+    @contextlib.contextmanager
+    def request_scope(self) -> Iterator[None]:
+        """Memoize embeddings for the duration of the ``with`` block."""
+        token = _request_memo.set({})
+        try:
+            yield
+        finally:
+            _request_memo.reset(token)
+
+    def encode(self, texts: Sequence[str], batch_size: int = 32) -> Any:
+        """Return a float32 ``(len(texts), dim)`` array, encoding each distinct text once."""
+        model = self.model
+        if model is None or np is None:
+            raise RuntimeError("Embedding model is not available")
+
+        # The tokenizer ignores surrounding whitespace, so stripped text is a safe memo key.
+        keys = [text.strip() for text in texts]
+        memo = _request_memo.get()
+        pending = [key for key in dict.fromkeys(keys) if memo is None or key not in memo]
+        encoded: dict[str, Any] = {}
+        if pending:
+            vectors = model.encode(pending, batch_size=batch_size, convert_to_tensor=False, show_progress_bar=False)
+            encoded = dict(zip(pending, np.asarray(vectors, dtype=np.float32)))
+            if memo is not None:
+                memo.update(encoded)
+        lookup = memo if memo is not None else encoded
+        return np.stack([lookup[key] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+
+    def prime(self, text: str, embedding: Any) -> None:
+        """Seed the current request scope with a precomputed embedding for ``text``."""
+        memo = _request_memo.get()
+        if memo is not None and np is not None:
+            memo[text.strip()] = np.asarray(embedding, dtype=np.float32)
+
+    @property
+    def version(self) -> str:
+        """Tag identifying which model, runtime and precision produced an embedding.
+
+        ONNX and PyTorch encodings of the same model differ slightly, so switching
+        ``EMBEDDING_BACKEND`` must invalidate stored vectors.
+        """
+        return f"{self.model_name}:{encoder_backend(self.model)}:{settings.INFERENCE_PRECISION}"
+
+    @staticmethod
+    def cosine(a: Any, b: Any) -> float:
+        denominator = float(np.linalg.norm(a) * np.linalg.norm(b))
+        if denominator == 0.0:
+            return 0.0
+        return float(np.dot(a, b) / denominator)
+
+    def similarity(self, text: str, other: str) -> float:
+        """Cosine similarity (-1..1) between two texts."""
+        first, second = self.encode([text, other])
+        return self.cosine(first, second)
+
+
+# Global instance (singleton pattern)
+_embedding_engine: EmbeddingEngine | None = None
+
+
+def get_embedding_engine() -> EmbeddingEngine:
+    """Get or create the global embedding engine instance."""
+    global _embedding_engine
+    if _embedding_engine is None:
+        _embedding_engine = EmbeddingEngine()
+    return _embedding_engine
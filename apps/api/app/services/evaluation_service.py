@@ -1,18 +1,9 @@
 """ML-based evaluation service using sentence-transformers for semantic similarity."""
 
-import functools
 import logging
 from typing import Any
 
-try:
-    from sentence_transformers import SentenceTransformer, util
-    import numpy as np
-except ImportError:
-    SentenceTransformer = None
-    util = None
-    np = None
-
-from app.core.config import settings
+from app.services.embedding_service import EmbeddingEngine, get_embedding_engine
 
 logger = logging.getLogger(__name__)
 
@@ -20,29 +11,15 @@ logger = logging.getLogger(__name__)
 class EvaluationService:
     """Service for ML-based answer evaluation using semantic similarity."""
 
-    def __init__(self) -> None:
-        """Initialize the evaluation service and load the ML model."""
-        self.model = self._load_model()
+    def __init__(self, engine: EmbeddingEngine | None = None) -> None:
+        """Initialize the evaluation service on the shared embedding engine."""
+        self.engine = engine or get_embedding_engine()
         if self.model is None:
             logger.warning("SentenceTransformer not available. ML evaluation will not work properly.")
 
-    @functools.lru_cache(maxsize=1)
-    def _load_model(self) -> Any | None:
-        """Load the sentence transformer model once at startup."""
-        if SentenceTransformer is None:
-            logger.warning("SentenceTransformer not installed; ML evaluation unavailable")
-            return None
-        
-        try:
-            # Use paraphrase-MiniLM-L6-v2 for semantic similarity
-            model_name = "paraphrase-MiniLM-L6-v2"
-            logger.info(f"Loading ML model: {model_name}")
-            model = SentenceTransformer(model_name)
-            logger.info("ML model loaded successfully")
-            return model
-        except Exception as e:
-            logger.error(f"Failed to load ML model: {e}")
-            return None
+    @property
+    def model(self) -> Any | None:
+        return self.engine.model
 
     def evaluate_answer(self, student_text: str, reference_text: str) -> dict[str, Any]:
         """
@@ -55,7 +32,7 @@ class EvaluationService:
         Returns:
             Dictionary with score (0-10), confidence (0-1), and similarity (0-1)
         """
-        if self.model is None or util is None:
+        if not self.engine.available:
             logger.warning("ML model not available, using fallback scoring")
             # Fallback to simple text similarity
             similarity = self._fallback_similarity(student_text, reference_text)
@@ -81,35 +58,8 @@ class EvaluationService:
                     "method": "ml"
                 }
 
-            # Generate embeddings
-            embeddings = self.model.encode(
-                [student_text, reference_text],
-                convert_to_tensor=True,
-                show_progress_bar=False
-            )
-
-            # Calculate cosine similarity
-            similarity = util.cos_sim(embeddings[0], embeddings[1]).item()
-            
-            # Normalize similarity to 0-1 range (cosine similarity is already -1 to 1, but typically 0-1)
-            similarity = max(0.0, min(1.0, (similarity + 1) / 2))
-            
-            # Convert similarity to score (0-10)
-            score = self._similarity_to_score(similarity)
-            
-            # Confidence is the normalized similarity
-            confidence = similarity
-
-            logger.debug(
-                f"Evaluation: similarity={similarity:.3f}, score={score:.2f}, confidence={confidence:.3f}"
-            )
-
-            return {
-                "score": round(score, 2),
-                "confidence": round(confidence, 3),
-                "similarity": round(similarity, 3),
-                "method": "ml"
-            }
+            # Calculate cosine similarity (embeddings are memoized by the shared engine)
+            return self.result_from_cosine(self.engine.similarity(student_text, reference_text))
 
         except Exception as e:
             logger.error(f"Error in ML evaluation: {e}", exc_info=True)
@@ -123,6 +73,28 @@ class EvaluationService:
                 "method": "fallback_error"
             }
 
+    def result_from_cosine(self, cosine: float) -> dict[str, Any]:
+        """Build the ML evaluation result for a raw cosine similarity (-1 to 1)."""
+        # Normalize similarity to 0-1 range (cosine similarity is already -1 to 1, but typically 0-1)
+        similarity = max(0.0, min(1.0, (cosine + 1) / 2))
+
+        # Convert similarity to score (0-10)
+        score = self._similarity_to_score(similarity)
+
+        # Confidence is the normalized similarity
+        confidence = similarity
+
+        logger.debug(
+            f"Evaluation: similarity={similarity:.3f}, score={score:.2f}, confidence={confidence:.3f}"
+        )
+
+        return {
+            "score": round(score, 2),
+            "confidence": round(confidence, 3),
+            "similarity": round(similarity, 3),
+            "method": "ml"
+        }
+
     def _similarity_to_score(self, similarity: float) -> float:
         """
         Convert similarity (0-1) to score (0-10) based on thresholds.
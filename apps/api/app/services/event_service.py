@@ -0,0 +1,137 @@
+"""Progress events published over Redis pub/sub and streamed as Server-Sent Events."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from app.core.config import settings
+from app.core.redis import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+SUBMISSION_TERMINAL_STAGES = {"graded", "flagged", "failed", "not_found"}
+JOB_TERMINAL_STAGES = {"completed", "failed"}
+
+
+def submission_channel(submission_id: int) -> str:
+    return f"events:submission:{submission_id}"
+
+
+def job_channel(job_id: str) -> str:
+    return f"events:job:{job_id}"
+
+
+def _snapshot_key(channel: str) -> str:
+    return f"{channel}:last"
+
+
+def _event_payload(event_type: str, stage: str, data: dict[str, Any]) -> str:
+    return json.dumps(
+        {"type": event_type, "stage": stage, **data, "timestamp": dt.datetime.utcnow().isoformat()},
+        default=str,
+    )
+
+
+def status_event(event_type: str, stage: str, **data: Any) -> str:
+    """A payload describing state read from the database rather than from a published event."""
+    return _event_payload(event_type, stage, {**data, "source": "database"})
+
+
+def publish_event(channel: str, event_type: str, stage: str, **data: Any) -> None:
+    """Publish an event and remember it as the channel's latest state."""
+    client = get_redis()
+    if client is None:
+        return
+    payload = _event_payload(event_type, stage, data)
+    try:
+        pipe = client.pipeline()
+        pipe.set(_snapshot_key(channel), payload, ex=settings.EVENT_SNAPSHOT_TTL_SECONDS)
+        pipe.publish(channel, payload)
+        pipe.execute()
+    except Exception as exc:  # pragma: no cover - events are best effort
+        logger.warning("Failed to publish %s event on %s: %s", stage, channel, exc)
+
+
+async def publish_event_async(channel: str, event_type: str, stage: str, **data: Any) -> None:
+    """Async variant of :func:`publish_event` for API handlers."""
+    client = get_async_redis()
+    if client is None:
+        return
+    payload = _event_payload(event_type, stage, data)
+    try:
+        pipe = client.pipeline()
+        pipe.set(_snapshot_key(channel), payload, ex=settings.EVENT_SNAPSHOT_TTL_SECONDS)
+        pipe.publish(channel, payload)
+        await pipe.execute()
+    except Exception as exc:  # pragma: no cover - events are best effort
+        logger.warning("Failed to publish %s event on %s: %s", stage, channel, exc)
+
+
+def publish_submission_event(submission_id: int, stage: str, **data: Any) -> None:
+    publish_event(submission_channel(submission_id), "submission", stage, submission_id=submission_id, **data)
+
+
+def publish_job_event(job_id: str, stage: str, **data: Any) -> None:
+    publish_event(job_channel(job_id), "job", stage, job_id=job_id, **data)
+
+
+def _format_sse(event_type: str, payload: str) -> str:
+    return f"event: {event_type}\ndata: {payload}\n\n"
+
+
+async def stream_events(channel: str, terminal_stages: set[str], fallback: str | None = None) -> AsyncIterator[str]:
+    """Yield SSE frames for ``channel`` until a terminal stage is seen.
+
+    The latest stored event is sent first so late subscribers start from the current
+    state. When the snapshot has expired or was never written, ``fallback`` (a
+    :func:`status_event` payload read from the database) is sent instead, so a
+    subscriber to already finished work gets its terminal event rather than waiting
+    forever. A comment frame is sent every ``EVENT_HEARTBEAT_SECONDS`` to keep
+    proxies from closing idle connections.
+    """
+    client = get_async_redis()
+    if client is None:
+        yield _format_sse("error", json.dumps({"detail": "Event stream unavailable"}))
+        return
+
+    pubsub = client.pubsub()
+    # Subscribe before reading the snapshot so no event can fall in between.
+    await pubsub.subscribe(channel)
+    try:
+        snapshot = await client.get(_snapshot_key(channel))
+        if snapshot is None:
+            snapshot = fallback
+        if snapshot is not None:
+            event = json.loads(snapshot)
+            yield _format_sse(event["type"], snapshot.decode() if isinstance(snapshot, bytes) else snapshot)
+            if event.get("stage") in terminal_stages:
+                return
+
+        loop = asyncio.get_running_loop()
+        last_sent = loop.time()
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=settings.EVENT_HEARTBEAT_SECONDS
+            )
+            if message is None:
+                # Skipped subscribe acknowledgements also return None, so only
+                # emit a heartbeat once the interval has actually elapsed.
+                if loop.time() - last_sent >= settings.EVENT_HEARTBEAT_SECONDS:
+                    yield ": keep-alive\n\n"
+                    last_sent = loop.time()
+                continue
+            last_sent = loop.time()
+            raw = message["data"]
+            payload = raw.decode() if isinstance(raw, bytes) else raw
+            event = json.loads(payload)
+            yield _format_sse(event["type"], payload)
+            if event.get("stage") in terminal_stages:
+                return
+    finally:
+        await pubsub.unsubscribe(channel)
+        await pubsub.aclose()
@@ -0,0 +1,156 @@
+"""Exam-wide batched semantic scoring."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Evaluation, Feedback, Question, Submission
+from app.services.analytics_aggregate_service import AggregateDelta, apply_aggregate_delta
+from app.services.embedding_service import EmbeddingEngine, get_embedding_engine
+from app.services.evaluation_service import EvaluationService, get_evaluation_service
+from app.services.pipeline_service import ml_review_outcome
+from app.services.reference_embedding_service import ensure_reference_embedding
+
+logger = logging.getLogger(__name__)
+
+
+class ExamScoringService:
+    """Score an exam's OCR'd answers with batched embeddings.
+
+    Student answers are encoded in large batches and compared against the stored
+    reference embedding with a single matrix-vector product per chunk; results are
+    written back with bulk UPDATEs instead of one ORM flush per submission.
+    """
+
+    def __init__(
+        self,
+        engine: EmbeddingEngine | None = None,
+        evaluation_service: EvaluationService | None = None,
+    ) -> None:
+        self.engine = engine or get_embedding_engine()
+        self.evaluation_service = evaluation_service or get_evaluation_service()
+        self.chunk_size = max(settings.EXAM_SCORING_CHUNK_SIZE, 1)
+        self.batch_size = max(settings.EMBEDDING_BATCH_SIZE, 1)
+
+    def _load_question(self, session: Session, exam_id: int, question_id: int | None) -> Question | None:
+        if question_id is not None:
+            return session.get(Question, question_id)
+        return session.execute(
+            select(Question).where(Question.exam_id == exam_id).order_by(Question.id).limit(1)
+        ).scalar_one_or_none()
+
+    def _similarities(self, answers: list[str], reference: Any) -> Any:
+        embeddings = self.engine.encode(answers, batch_size=self.batch_size)
+        norms = np.linalg.norm(embeddings, axis=1) * float(np.linalg.norm(reference))
+        return np.divide(embeddings @ reference, norms, out=np.zeros(len(answers), dtype=np.float32), where=norms > 0)
+
+    @staticmethod
+    def _pending(rescore: bool) -> list[Any]:
+        """Filters selecting the evaluations a run may overwrite.
+
+        Answers a teacher has left feedback on are never touched. Unless
+        ``rescore`` is set, neither are answers the embedding model already
+        scored, so only ones written by the text-similarity fallback (model
+        unavailable or failed) or without an ML result are picked up.
+        """
+        reviewed = select(Feedback.id).where(Feedback.evaluation_id == Evaluation.id).exists()
+        filters = [~reviewed]
+        if not rescore:
+            method = Evaluation.score_breakdown["ml_evaluation"]["method"].as_string()
+            filters.append(or_(method.is_(None), method != "ml"))
+        return filters
+
+    def score_exam(
+        self, session: Session, exam_id: int, question_id: int | None = None, rescore: bool = False
+    ) -> dict[str, Any]:
+        """Score the exam's unscored answers, or every unreviewed one with ``rescore``
+        (e.g. after the model answer changed)."""
+        if not self.engine.available or np is None:
+            return {"exam_id": exam_id, "scored": 0, "status": "model_unavailable"}
+
+        question = self._load_question(session, exam_id, question_id)
+        if question is None or not (question.model_answer or "").strip():
+            return {"exam_id": exam_id, "scored": 0, "status": "no_reference_answer"}
+        reference_text = question.model_answer
+        reference = ensure_reference_embedding(question, self.engine)
+        session.commit()
+
+        scored = 0
+        flagged = 0
+        last_id = 0
+        while True:
+            rows = session.execute(
+                select(
+                    Evaluation.id,
+                    Evaluation.submission_id,
+                    Evaluation.student_answer,
+                    Evaluation.score_breakdown,
+                    Evaluation.final_score,
+                    Evaluation.confidence,
+                )
+                .join(Submission, Submission.id == Evaluation.submission_id)
+                .where(
+                    Submission.exam_id == exam_id,
+                    Evaluation.student_answer.is_not(None),
+                    Evaluation.id > last_id,
+                    *self._pending(rescore),
+                )
+                .order_by(Evaluation.id)
+                .limit(self.chunk_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            answers = [(row.student_answer or "").strip() for row in rows]
+            non_empty = [index for index, answer in enumerate(answers) if answer]
+            cosines = np.full(len(rows), -1.0, dtype=np.float32)
+            if non_empty:
+                cosines[non_empty] = self._similarities([answers[index] for index in non_empty], reference)
+
+            evaluation_updates = []
+            submission_updates = []
+            # Bulk UPDATEs skip the ORM events, so adjust the analytics totals here.
+            # Missing keywords are untouched by re-scoring.
+            aggregate_delta = AggregateDelta()
+            for row, answer, cosine in zip(rows, answers, cosines.tolist()):
+                if answer:
+                    result = self.evaluation_service.result_from_cosine(cosine)
+                else:
+                    result = {"score": 0.0, "confidence": 0.0, "similarity": 0.0, "method": "ml"}
+                status, feedback = ml_review_outcome(result["confidence"])
+                if status == "flagged":
+                    flagged += 1
+                evaluation_updates.append(
+                    {
+                        "id": row.id,
+                        "final_score": result["score"],
+                        "confidence": result["confidence"],
+                        "similarity": result["similarity"],
+                        "reference_answer": reference_text,
+                        "feedback": feedback,
+                        "score_breakdown": {**(row.score_breakdown or {}), "ml_evaluation": result},
+                    }
+                )
+                submission_updates.append({"id": row.submission_id, "status": status})
+                aggregate_delta.add(row.final_score, row.confidence, None, sign=-1)
+                aggregate_delta.add(result["score"], result["confidence"], None)
+
+            session.execute(update(Evaluation), evaluation_updates)
+            apply_aggregate_delta(session.connection(), exam_id, aggregate_delta)
+            session.execute(update(Submission), submission_updates)
+            session.commit()
+            scored += len(rows)
+            logger.info("Exam %s: scored %d answers", exam_id, scored)
+
+        return {"exam_id": exam_id, "question_id": question.id, "scored": scored, "flagged": flagged, "status": "completed"}
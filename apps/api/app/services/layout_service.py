@@ -3,11 +3,21 @@
 import logging
 from typing import Any
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from app.utils.image import DecodedImage
+
 logger = logging.getLogger(__name__)
 
 
 class LayoutService:
     def __init__(self) -> None:
+        # YOLO letterboxes to 640px itself; handing it a bounded copy skips
+        # resizing full 300-DPI scans on every call.
+        self.max_side = 1280
         try:
             from ultralytics import YOLO  # type: ignore
 
@@ -16,18 +26,22 @@ class LayoutService:
             logger.warning("YOLOv8 not available: %s", exc)
             self.model = None
 
-    def detect(self, image_path: str) -> dict[str, Any]:
+    def detect(self, image: DecodedImage | str) -> dict[str, Any]:
         if self.model is None:
             logger.debug("Returning stub layout detection result")
             return {"boxes": [], "confidence": 0.5, "question_segments": []}
 
-        results = self.model(image_path)
+        decoded = DecodedImage.ensure(image)
+        pixels = decoded.downscaled(self.max_side)
+        scale = decoded.rgb.shape[1] / pixels.shape[1]
+        # Ultralytics treats numpy input as BGR, so flip the RGB view's channels.
+        results = self.model(np.ascontiguousarray(pixels[:, :, ::-1]))
         boxes = []
         for result in results:
             for box in result.boxes:
                 boxes.append(
                     {
-                        "bbox": box.xyxy[0].tolist(),
+                        "bbox": [coord * scale for coord in box.xyxy[0].tolist()],
                         "confidence": float(box.conf[0]),
                         "label": result.names[int(box.cls[0])],
                     }
@@ -0,0 +1,82 @@
+"""Page-to-lines segmentation for single-line OCR models."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+try:
+    import cv2  # type: ignore
+    import numpy as np
+except Exception:  # pragma: no cover
+    cv2 = None  # type: ignore
+    np = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+class LineSegmentationService:
+    """Split a page into text-line boxes using a horizontal projection profile."""
+
+    def __init__(self, min_line_height: int = 12, max_gap: int = 4, padding: int = 6) -> None:
+        self.min_line_height = min_line_height
+        self.max_gap = max_gap
+        self.padding = padding
+
+    def _binarize(self, gray: Any) -> Any:
+        blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+        _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        # Smear ink horizontally so words on one line form a single band.
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(gray.shape[1] // 40, 3), 1))
+        return cv2.dilate(binary, kernel, iterations=1)
+
+    def _row_bands(self, binary: Any) -> list[tuple[int, int]]:
+        profile = (binary > 0).sum(axis=1)
+        threshold = max(int(profile.max() * 0.02), 1) if profile.size else 1
+        bands: list[tuple[int, int]] = []
+        start: int | None = None
+        gap = 0
+        for row, value in enumerate(profile):
+            if value >= threshold:
+                if start is None:
+                    start = row
+                gap = 0
+            elif start is not None:
+                gap += 1
+                if gap > self.max_gap:
+                    bands.append((start, row - gap + 1))
+                    start, gap = None, 0
+        if start is not None:
+            bands.append((start, len(profile) - gap))
+        return [(top, bottom) for top, bottom in bands if bottom - top >= self.min_line_height]
+
+    def segment(self, image: Any) -> list[tuple[int, int, int, int]]:
+        """Return ``(left, top, right, bottom)`` line boxes in reading order.
+
+        ``image`` is an RGB or grayscale ``numpy`` array. An empty list means no
+        usable lines were found and the caller should treat the page as one line.
+        """
+        if cv2 is None or np is None:  # pragma: no cover
+            logger.warning("OpenCV not available; skipping line segmentation")
+            return []
+        try:
+            gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+            binary = self._binarize(gray)
+            height, width = gray.shape[:2]
+            boxes: list[tuple[int, int, int, int]] = []
+            for top, bottom in self._row_bands(binary):
+                columns = np.flatnonzero((binary[top:bottom] > 0).any(axis=0))
+                if columns.size == 0:
+                    continue
+                boxes.append(
+                    (
+                        max(int(columns[0]) - self.padding, 0),
+                        max(top - self.padding, 0),
+                        min(int(columns[-1]) + self.padding + 1, width),
+                        min(bottom + self.padding, height),
+                    )
+                )
+            return boxes
+        except Exception as exc:  # pragma: no cover
+            logger.error("Line segmentation failed: %s", exc)
+            return []
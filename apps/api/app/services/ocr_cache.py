@@ -0,0 +1,141 @@
+"""Content-addressed cache for OCR results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class OCRResultCache:
+    """Two-tier OCR cache: a size-bounded local disk LRU in front of Redis.
+
+    Entries are keyed by the SHA-256 of the image bytes, the OCR model name and
+    the language hint, so re-grading an unchanged file never re-runs the model.
+    """
+
+    key_prefix = "ocr:"
+
+    def __init__(self) -> None:
+        self.enabled = settings.OCR_CACHE_ENABLED
+        self.ttl_seconds = settings.OCR_CACHE_TTL_SECONDS
+        self.max_disk_bytes = settings.OCR_CACHE_MAX_BYTES
+        self.cache_dir = Path(settings.OCR_CACHE_DIR)
+        self._disk_bytes: int | None = None
+
+    @staticmethod
+    def make_key(image_hash: str, model_name: str, language_hint: str | None) -> str:
+        raw = f"{image_hash}:{model_name}:{language_hint or 'auto'}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _disk_get(self, key: str) -> dict[str, Any] | None:
+        path = self._disk_path(key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:  # pragma: no cover
+            pass
+        return payload
+
+    def _disk_set(self, key: str, payload: dict[str, Any]) -> None:
+        path = self._disk_path(key)
+        try:
+            previous_size = path.stat().st_size
+        except OSError:
+            previous_size = 0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as exc:  # pragma: no cover
+            logger.warning("Failed to write OCR cache entry: %s", exc)
+            return
+        if self._disk_bytes is None:
+            self._evict()
+        else:
+            # Overwriting an entry only adds the difference in size
+            self._disk_bytes += path.stat().st_size - previous_size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the disk tier fits its budget."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:  # pragma: no cover - removed concurrently
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total > self.max_disk_bytes:
+            total = self._drop_oldest(entries, total)
+        self._disk_bytes = total
+
+    def _drop_oldest(self, entries: list[tuple[float, int, Path]], total: int) -> int:
+        for _, size, path in sorted(entries):
+            try:
+                path.unlink()
+            except OSError:  # pragma: no cover
+                continue
+            total -= size
+            if total <= self.max_disk_bytes:
+                break
+        return total
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        if not self.enabled:
+            return None
+        payload = self._disk_get(key)
+        if payload is not None:
+            return payload
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            raw = client.get(self.key_prefix + key)
+        except Exception as exc:  # pragma: no cover - cache is best effort
+            logger.warning("Redis OCR cache lookup failed: %s", exc)
+            return None
+        if raw is None:
+            return None
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            # A corrupt entry is a miss; drop it so the fresh result replaces it
+            logger.warning("Discarding unreadable Redis OCR cache entry %s", key)
+            try:
+                client.delete(self.key_prefix + key)
+            except Exception:  # pragma: no cover - cache is best effort
+                pass
+            return None
+        self._disk_set(key, payload)
+        return payload
+
+    def set(self, key: str, payload: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        self._disk_set(key, payload)
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.set(self.key_prefix + key, json.dumps(payload), ex=self.ttl_seconds or None)
+        except Exception as exc:  # pragma: no cover - cache is best effort
+            logger.warning("Redis OCR cache write failed: %s", exc)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import functools
 import logging
-from typing import Any
+from typing import Any, Sequence
 
 try:
     from langdetect import detect
@@ -19,6 +19,10 @@ except ImportError:  # pragma: no cover
     TrOCRProcessor = VisionEncoderDecoderModel = Image = torch = None  # type: ignore
 
 from app.core.config import settings
+from app.services.line_segmentation_service import LineSegmentationService
+from app.services.ocr_cache import OCRResultCache
+from app.utils.image import DecodedImage
+from app.utils.inference import apply_inference_precision
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,9 @@ class OCRService:
     def __init__(self) -> None:
         self.en_model_name = settings.OCR_MODEL_EN
         self.hi_model_name = settings.OCR_MODEL_HI
+        self.batch_size = max(settings.OCR_BATCH_SIZE, 1)
+        self.line_segmenter = LineSegmentationService() if settings.OCR_LINE_SEGMENTATION else None
+        self.cache = OCRResultCache()
 
     @functools.lru_cache(maxsize=2)
     def _load_model(self, model_name: str) -> tuple[Any, Any] | None:
@@ -36,7 +43,7 @@ class OCRService:
         processor = TrOCRProcessor.from_pretrained(model_name)
         model = VisionEncoderDecoderModel.from_pretrained(model_name)
         model.eval()
-        return processor, model
+        return processor, apply_inference_precision(model)
 
     def _infer_language(self, image_text_hint: str | None = None) -> str:
         if image_text_hint:
@@ -54,42 +61,165 @@ class OCRService:
         except Exception:  # pragma: no cover
             return fallback
 
-    def _run_tesseract(self, image_path: str) -> tuple[str, float]:
+    def _target_language(self, language_hint: str | None) -> str:
+        language = language_hint if language_hint not in {None, "auto"} else None
+        return language or self._infer_language(None)
+
+    def _model_name_for(self, target_language: str) -> str:
+        return self.hi_model_name if target_language.startswith("hi") else self.en_model_name
+
+    def _cache_key(self, image: DecodedImage, model_name: str, language_hint: str | None) -> str | None:
+        if not self.cache.enabled:
+            return None
+        try:
+            image_hash = image.sha256
+        except OSError as exc:
+            logger.warning("Unable to hash %s for OCR cache: %s", image.path, exc)
+            return None
+        # Precision and line segmentation change the transcript, so both are part of the model identity.
+        model_tag = f"{model_name}@{settings.INFERENCE_PRECISION}"
+        if self.line_segmenter is not None:
+            model_tag += "+lines"
+        return self.cache.make_key(image_hash, model_tag, language_hint)
+
+    def _run_tesseract(self, image: DecodedImage) -> tuple[str, float]:
         try:
             import pytesseract
-            from PIL import Image
 
-            text = pytesseract.image_to_string(Image.open(image_path), lang="eng+hin")
+            text = pytesseract.image_to_string(image.pil, lang="eng+hin")
             return text.strip(), 0.6
         except Exception as exc:  # pragma: no cover
             logger.error("Tesseract fallback failed: %s", exc)
             return "", 0.0
 
-    def run(self, image_path: str, language_hint: str | None = None) -> dict[str, Any]:
-        language = language_hint if language_hint not in {None, "auto"} else None
-
-        target_language = language or self._infer_language(None)
-        model_name = self.hi_model_name if target_language.startswith("hi") else self.en_model_name
-        model_bundle = self._load_model(model_name)
-        if model_bundle is None:
-            text, confidence = self._run_tesseract(image_path)
-            detected_language = self._detect_language(text, target_language)
-            return {"text": text, "confidence": confidence, "language": detected_language, "engine": "tesseract"}
-
-        processor, model = model_bundle
-        assert processor is not None and model is not None
-
-        if Image is None or torch is None:  # pragma: no cover
-            text, confidence = self._run_tesseract(image_path)
-            detected_language = self._detect_language(text, target_language)
-            return {"text": text, "confidence": confidence, "language": detected_language, "engine": "tesseract"}
+    def _tesseract_result(self, image: DecodedImage, target_language: str) -> dict[str, Any]:
+        text, confidence = self._run_tesseract(image)
+        detected_language = self._detect_language(text, target_language)
+        return {"text": text, "confidence": confidence, "language": detected_language, "engine": "tesseract"}
 
-        image = Image.open(image_path).convert("RGB")
-        pixel_values = processor(images=image, return_tensors="pt").pixel_values
-        with torch.no_grad():  # type: ignore[attr-defined]
-            generated_ids = model.generate(pixel_values)
-        text = processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+    def _trocr_result(self, text: str, target_language: str) -> dict[str, Any]:
         detected_language = self._detect_language(text, target_language)
         confidence = 0.85 if detected_language.startswith("en") else 0.8
         return {"text": text.strip(), "confidence": confidence, "language": detected_language, "engine": "trocr"}
 
+    def _generate(self, processor: Any, model: Any, images: list[Any]) -> list[str]:
+        """Decode a list of images with a single ``generate`` call."""
+        # The processor resizes every image to the encoder resolution, so the
+        # pixel tensors stack into one batch without extra padding.
+        pixel_values = processor(images=images, return_tensors="pt").pixel_values
+        with torch.no_grad():  # type: ignore[attr-defined]
+            generated_ids = model.generate(pixel_values)
+        return processor.batch_decode(generated_ids, skip_special_tokens=True)
+
+    def _split_lines(self, image: DecodedImage) -> list[Any]:
+        """Crop a page into text lines, falling back to the whole page."""
+        if self.line_segmenter is None:
+            return [image.pil]
+        boxes = self.line_segmenter.segment(image.rgb)
+        if not boxes:
+            return [image.pil]
+        return [image.pil.crop(box) for box in boxes]
+
+    def _recognize_pages(
+        self, processor: Any, model: Any, images: list[DecodedImage], batch_size: int
+    ) -> list[str]:
+        """Decode every line of every page, batching line crops across pages."""
+        crops: list[Any] = []
+        owners: list[int] = []
+        for page_index, image in enumerate(images):
+            for crop in self._split_lines(image):
+                crops.append(crop)
+                owners.append(page_index)
+
+        lines: list[list[str]] = [[] for _ in images]
+        for start in range(0, len(crops), batch_size):
+            texts = self._generate(processor, model, crops[start : start + batch_size])
+            for page_index, text in zip(owners[start : start + batch_size], texts):
+                if text.strip():
+                    lines[page_index].append(text.strip())
+        return ["\n".join(page_lines) for page_lines in lines]
+
+    def run(self, image: DecodedImage | str, language_hint: str | None = None) -> dict[str, Any]:
+        image = DecodedImage.ensure(image)
+        target_language = self._target_language(language_hint)
+        model_name = self._model_name_for(target_language)
+        cache_key = self._cache_key(image, model_name, language_hint)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        model_bundle = self._load_model(model_name)
+        if model_bundle is None or Image is None or torch is None:
+            return self._tesseract_result(image, target_language)
+
+        processor, model = model_bundle
+        text = self._recognize_pages(processor, model, [image], self.batch_size)[0]
+        result = self._trocr_result(text, target_language)
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
+
+    def run_batch(
+        self,
+        images: Sequence[DecodedImage | str],
+        language_hint: str | Sequence[str | None] | None = None,
+        batch_size: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Run OCR over many images, decoding them in micro-batches per model.
+
+        ``images`` may be paths or :class:`DecodedImage` objects. ``language_hint``
+        may be a single hint applied to every image or one hint per image. Results
+        are returned in input order, in the same shape as :meth:`run`.
+        """
+        decoded = [DecodedImage.ensure(image) for image in images]
+        # Images we decoded ourselves are released after use to bound peak memory.
+        owned = [not isinstance(image, DecodedImage) for image in images]
+        if isinstance(language_hint, str) or language_hint is None:
+            hints: list[str | None] = [language_hint] * len(decoded)
+        else:
+            hints = list(language_hint)
+            if len(hints) != len(decoded):
+                raise ValueError("language_hint must have one entry per image")
+
+        size = max(batch_size or self.batch_size, 1)
+        results: list[dict[str, Any] | None] = [None] * len(decoded)
+
+        cache_keys: list[str | None] = [None] * len(decoded)
+        groups: dict[str, list[tuple[int, str]]] = {}
+        for index, (image, hint) in enumerate(zip(decoded, hints)):
+            target_language = self._target_language(hint)
+            model_name = self._model_name_for(target_language)
+            cache_keys[index] = self._cache_key(image, model_name, hint)
+            if cache_keys[index] is not None:
+                results[index] = self.cache.get(cache_keys[index])
+                if results[index] is not None:
+                    if owned[index]:
+                        image.release()
+                    continue
+            # Cache misses keep their decoded bytes for recognition below
+            groups.setdefault(model_name, []).append((index, target_language))
+
+        for model_name, entries in groups.items():
+            model_bundle = self._load_model(model_name)
+            if model_bundle is None or Image is None or torch is None:
+                for index, target_language in entries:
+                    results[index] = self._tesseract_result(decoded[index], target_language)
+                    if owned[index]:
+                        decoded[index].release()
+                continue
+
+            processor, model = model_bundle
+            for start in range(0, len(entries), size):
+                chunk = entries[start : start + size]
+                texts = self._recognize_pages(processor, model, [decoded[index] for index, _ in chunk], size)
+                for (index, target_language), text in zip(chunk, texts):
+                    results[index] = self._trocr_result(text, target_language)
+                    if cache_keys[index] is not None:
+                        self.cache.set(cache_keys[index], results[index])
+                    if owned[index]:
+                        decoded[index].release()
+
+        missing = [index for index, result in enumerate(results) if result is None]
+        assert not missing, f"OCR produced no result for inputs {missing}"
+        return results  # type: ignore[return-value]
@@ -2,8 +2,35 @@
 
 from __future__ import annotations
 
+import contextvars
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any
 
+StageFn = Callable[[dict[str, Any]], Any]
+
+
+DEFAULT_QUESTION_META: dict[str, Any] = {
+    "keywords": [],
+    "marks": 10,
+    "answer_type": "long",
+    "model_answer": "Photosynthesis is the process by which plants convert sunlight, water, and carbon dioxide into glucose and oxygen using chlorophyll in their leaves.",
+}
+
+
+def build_question_meta(question: Any | None) -> dict[str, Any]:
+    """Question metadata passed to the evaluation tasks, with demo defaults."""
+    if question is None:
+        return dict(DEFAULT_QUESTION_META)
+    return {
+        "question_id": question.id,
+        "keywords": question.keywords or [],
+        "marks": question.marks or DEFAULT_QUESTION_META["marks"],
+        "answer_type": question.answer_type or DEFAULT_QUESTION_META["answer_type"],
+        "model_answer": question.model_answer or DEFAULT_QUESTION_META["model_answer"],
+    }
+
 
 def compute_final_confidence(*, ocr_conf: float, semantic_score: float, layout_conf: float) -> float:
     final_conf = ocr_conf * 0.4 + semantic_score * 0.5 + layout_conf * 0.1
@@ -14,12 +41,67 @@ def flag_for_review(confidence: float, threshold: float = 0.7) -> bool:
     return confidence < threshold
 
 
+def ml_review_outcome(confidence: float, threshold: float = 0.5) -> tuple[str, str]:
+    """Return the submission status and feedback for an ML confidence value."""
+    if confidence < threshold:
+        return "flagged", "Low AI confidence - Teacher review needed"
+    return "graded", "Auto-graded with ML"
+
+
+def run_stage_graph(
+    stages: dict[str, tuple[tuple[str, ...], StageFn]], max_workers: int = 4
+) -> tuple[dict[str, Any], dict[str, float]]:
+    """Run ``{name: (dependencies, fn)}`` stages, overlapping independent ones.
+
+    Each ``fn`` receives the results of the stages completed so far and runs in a
+    copy of the caller's context, so request-scoped state (e.g. the embedding memo)
+    is visible to every stage. Returns the stage results and per-stage timings in
+    seconds, plus ``wall_clock`` and ``sequential_total`` for comparison.
+    """
+    for name, (dependencies, _) in stages.items():
+        unknown = set(dependencies) - stages.keys()
+        if unknown:
+            raise ValueError(f"Stage {name!r} depends on unknown stages {sorted(unknown)}")
+
+    results: dict[str, Any] = {}
+    timings: dict[str, float] = {}
+    remaining = dict(stages)
+    running: dict[Future, str] = {}
+
+    def timed(name: str, fn: StageFn, inputs: dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(inputs)
+        finally:
+            timings[name] = round(time.perf_counter() - started, 4)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix="pipeline-stage") as executor:
+        while remaining or running:
+            for name, (dependencies, fn) in list(remaining.items()):
+                if all(dependency in results for dependency in dependencies):
+                    context = contextvars.copy_context()
+                    future = executor.submit(context.run, timed, name, fn, dict(results))
+                    running[future] = name
+                    del remaining[name]
+            if not running:
+                raise ValueError(f"Stage graph has a cycle among {sorted(remaining)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    timings["sequential_total"] = round(sum(timings.values()), 4)
+    timings["wall_clock"] = round(time.perf_counter() - started, 4)
+    return results, timings
+
+
 def aggregate_scores(
     *,
     ocr_result: dict[str, Any],
     scoring_result: dict[str, Any],
     layout_result: dict[str, Any],
     diagram_result: dict[str, Any],
+    stage_timings: dict[str, float] | None = None,
 ) -> dict[str, Any]:
     confidence = compute_final_confidence(
         ocr_conf=float(ocr_result.get("confidence", 0.0)),
@@ -46,6 +128,7 @@ def aggregate_scores(
             "scoring": scoring_details,
             "layout": layout_result,
             "diagram": diagram_result,
+            "timings": stage_timings or {},
         },
     }
 
@@ -0,0 +1,103 @@
+"""Redis-backed progress counters for batch jobs."""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any
+
+from app.core.config import settings
+from app.core.redis import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgressTracker:
+    """Keeps ``total``/``completed``/``failed`` counters per job in a Redis hash.
+
+    Workers bump the counters atomically with ``HINCRBY`` as each file finishes, so
+    progress never needs a per-file write to the ``jobs`` table. Postgres is only
+    updated at coarse checkpoints (see :meth:`is_checkpoint`).
+    """
+
+    key_prefix = "job-progress:"
+
+    def __init__(self) -> None:
+        self.ttl_seconds = settings.JOB_PROGRESS_TTL_SECONDS
+        self.checkpoint_fraction = settings.JOB_PROGRESS_CHECKPOINT_FRACTION
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.key_prefix}{job_id}"
+
+    @staticmethod
+    def _snapshot(raw: dict[Any, Any]) -> dict[str, Any] | None:
+        if not raw:
+            return None
+        values = {(key.decode() if isinstance(key, bytes) else key): int(value) for key, value in raw.items()}
+        total = values.get("total", 0)
+        completed = values.get("completed", 0)
+        return {
+            "total": total,
+            "completed": completed,
+            "failed": values.get("failed", 0),
+            "progress": round(completed / total, 2) if total else 0.0,
+        }
+
+    def start(self, job_id: str, total: int) -> None:
+        client = get_redis()
+        if client is None:
+            return
+        key = self._key(job_id)
+        try:
+            pipe = client.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping={"total": total, "completed": 0, "failed": 0})
+            pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+        except Exception as exc:  # pragma: no cover - progress is best effort
+            logger.warning("Failed to initialise progress for job %s: %s", job_id, exc)
+
+    def record(self, job_id: str, failed: bool = False) -> tuple[int, int] | None:
+        """Count one finished file; returns ``(completed, total)``."""
+        client = get_redis()
+        if client is None:
+            return None
+        key = self._key(job_id)
+        try:
+            pipe = client.pipeline()
+            pipe.hincrby(key, "completed", 1)
+            pipe.hincrby(key, "failed", 1 if failed else 0)
+            pipe.hget(key, "total")
+            pipe.expire(key, self.ttl_seconds)
+            completed, _, total, _ = pipe.execute()
+        except Exception as exc:  # pragma: no cover - progress is best effort
+            logger.warning("Failed to record progress for job %s: %s", job_id, exc)
+            return None
+        return int(completed), int(total or 0)
+
+    def is_checkpoint(self, completed: int, total: int) -> bool:
+        """Whether ``completed`` crosses a coarse checkpoint worth persisting."""
+        if total <= 0 or completed >= total:
+            return False  # completion is written by the job's finalize step
+        step = max(math.ceil(total * self.checkpoint_fraction), 1)
+        return completed % step == 0
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            return self._snapshot(client.hgetall(self._key(job_id)))
+        except Exception as exc:  # pragma: no cover
+            logger.warning("Failed to read progress for job %s: %s", job_id, exc)
+            return None
+
+    async def get_async(self, job_id: str) -> dict[str, Any] | None:
+        client = get_async_redis()
+        if client is None:
+            return None
+        try:
+            return self._snapshot(await client.hgetall(self._key(job_id)))
+        except Exception as exc:  # pragma: no cover
+            logger.warning("Failed to read progress for job %s: %s", job_id, exc)
+            return None
@@ -0,0 +1,92 @@
+"""Precomputed model-answer embeddings stored on each Question."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Question
+from app.services.embedding_service import EmbeddingEngine, get_embedding_engine
+
+logger = logging.getLogger(__name__)
+
+
+def pack_embedding(vector: Any) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def unpack_embedding(blob: bytes) -> Any:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def embedding_version(engine: EmbeddingEngine, model_answer: str) -> str:
+    """Model version plus a digest of the text, so edited answers read as stale."""
+    digest = hashlib.sha256(model_answer.strip().encode()).hexdigest()[:16]
+    return f"{engine.version}:{digest}"
+
+
+def refresh_question_embedding(question: Question, engine: EmbeddingEngine | None = None) -> bool:
+    """Recompute ``question``'s reference embedding. Returns ``True`` when stored."""
+    engine = engine or get_embedding_engine()
+    model_answer = (question.model_answer or "").strip()
+    if not model_answer or not engine.available:
+        question.model_answer_embedding = None
+        question.embedding_version = None
+        return False
+    question.model_answer_embedding = pack_embedding(engine.encode([model_answer])[0])
+    question.embedding_version = embedding_version(engine, model_answer)
+    return True
+
+
+def get_reference_embedding(question: Question, engine: EmbeddingEngine | None = None) -> Any | None:
+    """Return the stored embedding if it was produced by the current model."""
+    engine = engine or get_embedding_engine()
+    if np is None or not question.model_answer_embedding:
+        return None
+    if question.embedding_version != embedding_version(engine, question.model_answer or ""):
+        return None
+    return unpack_embedding(question.model_answer_embedding)
+
+
+def ensure_reference_embedding(question: Question, engine: EmbeddingEngine | None = None) -> Any | None:
+    """Return a current embedding, recomputing it (caller commits) when missing or stale."""
+    engine = engine or get_embedding_engine()
+    embedding = get_reference_embedding(question, engine)
+    if embedding is None and refresh_question_embedding(question, engine):
+        logger.info("Recomputed reference embedding for question %s", question.id)
+        embedding = get_reference_embedding(question, engine)
+    return embedding
+
+
+def refresh_exam_embeddings(session: Session, exam_id: int, engine: EmbeddingEngine | None = None) -> int:
+    """Encode every missing or stale reference embedding for ``exam_id``; returns how many were stored.
+
+    Run from a worker after questions are created or edited, so the model never
+    loads inside a request or an ORM flush.
+    """
+    engine = engine or get_embedding_engine()
+    if not engine.available:
+        raise RuntimeError("Embedding model is not available")
+    questions = session.execute(select(Question).where(Question.exam_id == exam_id)).scalars().all()
+    stale = [question for question in questions if get_reference_embedding(question, engine) is None]
+    answered = [question for question in stale if (question.model_answer or "").strip()]
+    for question in stale:
+        if question not in answered:
+            question.model_answer_embedding = None
+            question.embedding_version = None
+    if answered:
+        vectors = engine.encode([question.model_answer.strip() for question in answered])
+        for question, vector in zip(answered, vectors):
+            question.model_answer_embedding = pack_embedding(vector)
+            question.embedding_version = embedding_version(engine, question.model_answer)
+    session.commit()
+    return len(answered)
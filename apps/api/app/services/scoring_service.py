@@ -4,15 +4,10 @@ from __future__ import annotations
 
 import functools
 import logging
-from typing import Any
+from typing import Any, Sequence
 
-from rapidfuzz import fuzz
-
-try:
-    from sentence_transformers import SentenceTransformer, util
-except ImportError:  # pragma: no cover
-    SentenceTransformer = None  # type: ignore
-    util = None  # type: ignore
+import numpy as np
+from rapidfuzz import fuzz, process
 
 try:  # pragma: no cover - optional dependency
     from deep_translator import GoogleTranslator
@@ -20,22 +15,23 @@ except Exception:  # pragma: no cover
     GoogleTranslator = None  # type: ignore
 
 from app.core.config import settings
+from app.services.embedding_service import EmbeddingEngine, get_embedding_engine
 from app.utils.text import normalize_text
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=256)
+def _normalized_keywords(keywords: tuple[str, ...]) -> tuple[str, ...]:
+    """Normalize a question's keywords once and reuse them across answers."""
+    return tuple(normalize_text(keyword) for keyword in keywords)
+
+
 class ScoringService:
-    def __init__(self) -> None:
+    def __init__(self, engine: EmbeddingEngine | None = None) -> None:
         self.kw_weight = settings.KW_WEIGHT
         self.sem_weight = settings.SEM_WEIGHT
-
-    @functools.lru_cache(maxsize=1)
-    def _load_model(self) -> Any | None:
-        if SentenceTransformer is None:
-            logger.warning("SentenceTransformer not installed; semantic scores will be approximate")
-            return None
-        return SentenceTransformer(settings.SENTENCE_TRANSFORMER_MODEL)
+        self.engine = engine or get_embedding_engine()
 
     def _translate(self, text: str) -> str:
         if GoogleTranslator is None:
@@ -47,33 +43,46 @@ class ScoringService:
             logger.error("Translation failed: %s", exc)
             return text
 
-    def _keyword_score(self, answer: str, keywords: list[str]) -> tuple[float, list[str], list[str]]:
+    def keyword_scores(
+        self, answers: Sequence[str], keywords: Sequence[str]
+    ) -> list[tuple[float, list[str], list[str]]]:
+        """Score many answers against one keyword list in a single ``cdist`` call."""
         if not keywords:
-            return 0.0, [], []
-
-        normalized_answer = normalize_text(answer)
-        total_score = 0.0
-        matched: list[str] = []
-        missed: list[str] = []
+            return [(0.0, [], []) for _ in answers]
+        if not answers:
+            return []
+
+        normalized_keywords = _normalized_keywords(tuple(keywords))
+        normalized_answers = [normalize_text(answer) for answer in answers]
+        scores = (
+            process.cdist(
+                normalized_answers,
+                normalized_keywords,
+                scorer=fuzz.partial_ratio,
+                dtype=np.float64,
+                # Single answers come from the pipeline's stage threads; only batches fan out
+                workers=-1 if len(normalized_answers) > 1 else 1,
+            )
+            / 100
+        )
+        matches = scores >= 0.7
+        averages = scores.mean(axis=1)
+
+        results: list[tuple[float, list[str], list[str]]] = []
+        for average, row in zip(averages.tolist(), matches.tolist()):
+            matched = [keyword for keyword, hit in zip(keywords, row) if hit]
+            missed = [keyword for keyword, hit in zip(keywords, row) if not hit]
+            results.append((average, matched, missed))
+        return results
 
-        for keyword in keywords:
-            normalized_kw = normalize_text(keyword)
-            score = fuzz.partial_ratio(normalized_answer, normalized_kw) / 100
-            total_score += score
-            if score >= 0.7:
-                matched.append(keyword)
-            else:
-                missed.append(keyword)
-
-        average = total_score / len(keywords)
-        return average, matched, missed
+    def _keyword_score(self, answer: str, keywords: list[str]) -> tuple[float, list[str], list[str]]:
+        return self.keyword_scores([answer], keywords)[0]
 
     def _semantic_score(self, answer: str, model_answer: str) -> float:
-        model = self._load_model()
-        if model is None or util is None:
+        if not self.engine.available:
+            logger.debug("Embedding model unavailable; semantic scores will be approximate")
             return fuzz.ratio(answer.lower(), model_answer.lower()) / 100
-        embeddings = model.encode([answer, model_answer], convert_to_tensor=True)
-        score = util.cos_sim(embeddings[0], embeddings[1]).item()
+        score = self.engine.similarity(answer, model_answer)
         return (score + 1) / 2  # normalize to 0-1
 
     def score(self, *, answer: str, question_meta: dict[str, Any]) -> dict[str, Any]:
@@ -0,0 +1,135 @@
+"""Content-addressed upload storage with reference counting and deduplication."""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.models import Evaluation, StoredObject, Submission
+from app.utils.storage import StoredFile, get_storage_backend
+
+logger = logging.getLogger(__name__)
+
+REUSABLE_STATUSES = {"graded", "flagged"}
+
+
+class StorageService:
+    """Tracks how many submissions point at each stored blob.
+
+    Blobs are only deleted from disk once the last submission referencing them is
+    gone, so deduplicated uploads can share one file safely. Methods do not commit;
+    callers commit alongside the submission rows they change.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def acquire(self, stored: StoredFile) -> None:
+        """Add a reference to ``stored``, creating its row on first upload."""
+        if await self._increment(stored.sha256):
+            return
+        try:
+            async with self.session.begin_nested():
+                self.session.add(
+                    StoredObject(sha256=stored.sha256, storage_path=stored.key, size=stored.size, ref_count=1)
+                )
+        except IntegrityError:
+            # A concurrent upload of the same bytes created the row first
+            await self._increment(stored.sha256)
+
+    async def _increment(self, sha256: str) -> bool:
+        result = await self.session.execute(
+            update(StoredObject)
+            .where(StoredObject.sha256 == sha256)
+            .values(ref_count=StoredObject.ref_count + 1)
+        )
+        return result.rowcount > 0
+
+    async def release(self, sha256: str) -> str | None:
+        """Drop a reference; returns the blob path once nothing points at it.
+
+        Remove the returned path with ``remove_blob`` only after committing.
+        """
+        result = await self.session.execute(
+            update(StoredObject)
+            .where(StoredObject.sha256 == sha256, StoredObject.ref_count > 0)
+            .values(ref_count=StoredObject.ref_count - 1)
+            .returning(StoredObject.ref_count, StoredObject.storage_path)
+        )
+        row = result.first()
+        if row is None or row.ref_count > 0:
+            return None
+        deleted = await self.session.execute(
+            delete(StoredObject).where(StoredObject.sha256 == sha256, StoredObject.ref_count <= 0)
+        )
+        return row.storage_path if deleted.rowcount else None
+
+    @staticmethod
+    async def remove_blob(storage_path: str) -> bool:
+        return await run_in_threadpool(get_storage_backend().delete, storage_path)
+
+    async def discard_if_unreferenced(self, stored: StoredFile) -> bool:
+        """Remove the blob of an upload whose submission was never committed.
+
+        Call after rolling back; a blob that an earlier submission still
+        references keeps its row and is left in place.
+        """
+        if await self.session.get(StoredObject, stored.sha256) is not None:
+            return False
+        try:
+            return await self.remove_blob(stored.key)
+        except Exception as exc:  # pragma: no cover - the request already failed
+            logger.warning("Failed to remove orphaned upload %s: %s", stored.key, exc)
+            return False
+
+    async def find_duplicate(self, exam_id: int, sha256: str) -> Submission | None:
+        """Earliest original submission of the same bytes for ``exam_id``."""
+        result = await self.session.execute(
+            select(Submission)
+            .where(
+                Submission.exam_id == exam_id,
+                Submission.content_hash == sha256,
+                Submission.duplicate_of_id.is_(None),
+            )
+            .order_by(Submission.id)
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def reuse_results(self, submission: Submission) -> Evaluation | None:
+        """Copy the original's evaluation onto a duplicate submission.
+
+        Returns None when the original has not finished grading, in which case the
+        duplicate has to go through the pipeline itself.
+        """
+        if submission.duplicate_of_id is None:
+            return None
+        original = await self.session.get(Submission, submission.duplicate_of_id)
+        if original is None or original.status not in REUSABLE_STATUSES:
+            return None
+        result = await self.session.execute(select(Evaluation).where(Evaluation.submission_id == original.id))
+        source = result.scalars().first()
+        if source is None:
+            return None
+
+        result = await self.session.execute(select(Evaluation).where(Evaluation.submission_id == submission.id))
+        evaluation = result.scalars().first()
+        if evaluation is None:
+            evaluation = Evaluation(submission_id=submission.id)
+            self.session.add(evaluation)
+        evaluation.score_breakdown = {**(source.score_breakdown or {}), "reused_from": original.id}
+        evaluation.final_score = source.final_score
+        evaluation.confidence = source.confidence
+        evaluation.feedback = source.feedback
+        evaluation.student_answer = source.student_answer
+        evaluation.reference_answer = source.reference_answer
+        evaluation.similarity = source.similarity
+        submission.status = original.status
+        submission.ocr_confidence = original.ocr_confidence
+        await self.session.flush()
+        logger.info("Submission %s reused results of duplicate %s", submission.id, original.id)
+        return evaluation
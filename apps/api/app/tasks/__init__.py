@@ -1,7 +1,7 @@
 """Celery task modules."""
 
-from .ocr import ocr_pipeline  # noqa: F401
-from .scoring import scoring_pipeline  # noqa: F401
+from .ocr import ocr_batch_pipeline, ocr_pipeline  # noqa: F401
+from .scoring import score_exam, scoring_pipeline  # noqa: F401
 from .batch import process_batch_job  # noqa: F401
 from .pipeline import evaluate_submission  # noqa: F401
 
@@ -2,38 +2,122 @@
 
 import logging
 
+from celery import chord, group
+from sqlalchemy import select, update
+
 from app.celery_app import celery_app
+from app.core.config import settings
 from app.core.database import get_sync_session
-from app.models import Job
+from app.models import Job, Question, Submission
+from app.services.event_service import publish_job_event
+from app.services.pipeline_service import build_question_meta
+from app.services.progress_service import JobProgressTracker
+from app.tasks.pipeline import evaluate_submission
 
 logger = logging.getLogger(__name__)
 
+progress_tracker = JobProgressTracker()
+
 
 @celery_app.task(name="app.tasks.batch.process")
-def process_batch_job(job_id: str, files: list[str]) -> dict:
-    logger.info("Processing batch job %s with %d files", job_id, len(files))
+def process_batch_job(job_id: str, submission_ids: list[int]) -> dict:
+    """Fan evaluation of already uploaded submissions out across the pipeline workers.
+
+    Submissions are evaluated in chunks of ``BATCH_CHUNK_SIZE`` per task; a chord
+    callback finalizes the job once every chunk has completed. Per-file progress is
+    counted in Redis by the evaluation tasks. The API checks that the submissions
+    belong to the job's user and exam before queueing it.
+    """
+    logger.info("Processing batch job %s with %d submissions", job_id, len(submission_ids))
     with get_sync_session() as session:
         job: Job | None = session.query(Job).filter(Job.job_id == job_id).first()
         if job is None:
             logger.error("Job %s not found", job_id)
             return {"job_id": job_id, "processed": 0, "status": "missing"}
 
-        total_files = max(len(files), 1)
+        metadata = job.job_metadata or {}
+        exam_id = metadata.get("exam_id")
+        if not submission_ids or exam_id is None:
+            job.status = "completed" if not submission_ids else "failed"
+            job.progress = 1.0
+            job.result = {"processed_files": [], "error": None if not submission_ids else "missing exam_id"}
+            session.commit()
+            return {"job_id": job_id, "processed": 0, "status": job.status, "progress": job.progress}
+
+        question = session.execute(
+            select(Question).where(Question.exam_id == exam_id).order_by(Question.id).limit(1)
+        ).scalar_one_or_none()
+        question_meta = build_question_meta(question)
+
+        session.execute(update(Submission).where(Submission.id.in_(submission_ids)).values(status="queued"))
+
+        chunk_size = max(settings.BATCH_CHUNK_SIZE, 1)
+        chunked = evaluate_batch_submission.chunks([(sid, question_meta, job_id) for sid in submission_ids], chunk_size)
+        header = group(signature.set(queue="pipeline") for signature in chunked.group().tasks)
+        summary = {"total_files": len(submission_ids), "total_chunks": len(header.tasks)}
+
+        # Submission statuses and the job state are committed before dispatch so workers can see them
         job.status = "processing"
         job.progress = 0.0
+        job.result = summary
         session.commit()
+        progress_tracker.start(job_id, len(submission_ids))
+        publish_job_event(job_id, "processing", completed=0, total=len(submission_ids), progress=0.0)
 
-        processed_files: list[dict] = []
-        for index, file_path in enumerate(files, start=1):
-            # TODO: enqueue individual OCR/scoring tasks per file_path
-            processed_files.append({"file": file_path, "status": "processed"})
-            job.progress = round(index / total_files, 2)
-            session.commit()
+        callback = finalize_batch_job.s(job_id, submission_ids).on_error(fail_batch_job.si(job_id))
+        chord(header)(callback)
+
+        return {"job_id": job_id, "submissions": len(submission_ids), "chunks": len(header.tasks), "status": job.status}
+
+
+@celery_app.task(name="app.tasks.batch.evaluate")
+def evaluate_batch_submission(submission_id: int, question_meta: dict, job_id: str) -> dict:
+    """Evaluate one file of a batch, reporting a failure instead of raising it.
+
+    Chunks run their files in sequence, so an exception would skip the rest of the
+    chunk and trip the chord errback; one unreadable file must not fail the job.
+    """
+    try:
+        return evaluate_submission(submission_id, question_meta, job_id)
+    except Exception as exc:
+        logger.warning("Batch %s: submission %s failed: %s", job_id, submission_id, exc)
+        return {"status": "failed", "submission_id": submission_id, "error": str(exc)}
+
+
+@celery_app.task(name="app.tasks.batch.finalize")
+def finalize_batch_job(chunk_results: list[list[dict]], job_id: str, submission_ids: list[int]) -> dict:
+    outcomes = [outcome for chunk in chunk_results for outcome in (chunk or [])]
+    processed_files = [
+        {
+            "submission_id": submission_id,
+            "status": outcome.get("status"),
+            **({"error": outcome["error"]} if outcome.get("error") else {}),
+        }
+        for submission_id, outcome in zip(submission_ids, outcomes)
+    ]
+    failed = sum(1 for entry in processed_files if entry["status"] in {"failed", "not_found"})
+    with get_sync_session() as session:
+        job: Job | None = session.query(Job).filter(Job.job_id == job_id).first()
+        if job is None:
+            logger.error("Job %s not found", job_id)
+            return {"job_id": job_id, "processed": 0, "status": "missing"}
 
         job.status = "completed"
         job.progress = 1.0
-        job.result = {"processed_files": processed_files}
+        job.result = {"processed_files": processed_files, "failed": failed}
         session.commit()
+        publish_job_event(
+            job_id, "completed", completed=len(processed_files), total=len(submission_ids), failed=failed, progress=1.0
+        )
 
         return {"job_id": job_id, "processed": len(processed_files), "status": job.status, "progress": job.progress}
 
+
+@celery_app.task(name="app.tasks.batch.fail")
+def fail_batch_job(job_id: str) -> None:
+    with get_sync_session() as session:
+        job: Job | None = session.query(Job).filter(Job.job_id == job_id).first()
+        if job is not None:
+            job.status = "failed"
+            session.commit()
+    publish_job_event(job_id, "failed")
@@ -2,15 +2,17 @@
 
 from app.celery_app import celery_app
 from app.services.ocr_service import OCRService
+from app.utils.storage import get_storage_backend
 
 ocr_service = OCRService()
 
 
 @celery_app.task(name="app.tasks.ocr.run")
 def ocr_pipeline(image_path: str, language_hint: str | None = None) -> dict:
-    return ocr_service.run(image_path, language_hint)
-
-
-
+    return ocr_service.run(str(get_storage_backend().local_path(image_path)), language_hint)
 
 
+@celery_app.task(name="app.tasks.ocr.run_batch")
+def ocr_batch_pipeline(image_paths: list[str], language_hint: str | list[str | None] | None = None) -> list[dict]:
+    storage = get_storage_backend()
+    return ocr_service.run_batch([str(storage.local_path(path)) for path in image_paths], language_hint)
@@ -1,49 +1,140 @@
 """Celery pipeline task combining OCR, layout detection, ML evaluation, and persistence."""
 
+import logging
+
 from app.celery_app import celery_app
+from app.core.config import settings
 from app.core.database import get_sync_session
-from app.models import Evaluation, Submission
+from sqlalchemy import update
+
+from app.models import Evaluation, Job, Question, Submission
+from app.services.analytics_cache_service import invalidate_analytics
 from app.services.diagram_service import DiagramService
+from app.services.embedding_service import get_embedding_engine
 from app.services.evaluation_service import get_evaluation_service
+from app.services.event_service import publish_job_event, publish_submission_event
 from app.services.layout_service import LayoutService
 from app.services.ocr_service import OCRService
-from app.services.pipeline_service import aggregate_scores
+from app.services.pipeline_service import aggregate_scores, ml_review_outcome, run_stage_graph
+from app.services.progress_service import JobProgressTracker
+from app.services.reference_embedding_service import ensure_reference_embedding
 from app.services.scoring_service import ScoringService
+from app.utils.image import DecodedImage
+from app.utils.storage import get_storage_backend
+
+logger = logging.getLogger(__name__)
 
 ocr_service = OCRService()
 layout_service = LayoutService()
 diagram_service = DiagramService()
 scoring_service = ScoringService()
 evaluation_service = get_evaluation_service()
+embedding_engine = get_embedding_engine()
+progress_tracker = JobProgressTracker()
 
 
 @celery_app.task(name="app.tasks.pipeline.evaluate")
-def evaluate_submission(submission_id: int, question_meta: dict) -> dict:
+def evaluate_submission(submission_id: int, question_meta: dict, job_id: str | None = None) -> dict:
+    try:
+        # ML evaluation and keyword scoring share one engine; the scope makes sure the
+        # student and reference answers are each encoded only once per task.
+        with embedding_engine.request_scope():
+            result = _evaluate_submission(submission_id, question_meta)
+    except Exception as exc:
+        _mark_submission_failed(submission_id)
+        publish_submission_event(submission_id, "failed", error=str(exc))
+        if job_id is not None:
+            _record_job_progress(job_id, failed=True)
+        raise
+    if result.get("status") == "not_found":
+        publish_submission_event(submission_id, "not_found")
+    if job_id is not None:
+        _record_job_progress(job_id, failed=result.get("status") == "not_found")
+    return result
+
+
+def _mark_submission_failed(submission_id: int) -> None:
+    # Persisted so status reads (and SSE subscribers without a snapshot) see the failure
+    try:
+        with get_sync_session() as session:
+            session.execute(update(Submission).where(Submission.id == submission_id).values(status="failed"))
+            session.commit()
+    except Exception as exc:  # pragma: no cover - the original error is re-raised
+        logger.warning("Could not mark submission %s failed: %s", submission_id, exc)
+
+
+def _record_job_progress(job_id: str, failed: bool) -> None:
+    counts = progress_tracker.record(job_id, failed=failed)
+    if counts is None:
+        return
+    completed, total = counts
+    progress = round(completed / total, 2) if total else 0.0
+    publish_job_event(job_id, "processing", completed=completed, total=total, progress=progress)
+    if not progress_tracker.is_checkpoint(completed, total):
+        return
+    with get_sync_session() as session:
+        session.execute(
+            update(Job)
+            .where(Job.job_id == job_id, Job.status == "processing")
+            .values(progress=progress)
+        )
+        session.commit()
+
+
+def _evaluate_submission(submission_id: int, question_meta: dict) -> dict:
     with get_sync_session() as session:
         submission: Submission | None = session.get(Submission, submission_id)
         if submission is None:
             return {"status": "not_found"}
 
-        # Run OCR to get student answer text
-        ocr_result = ocr_service.run(submission.storage_path, submission.language)
-        student_text = ocr_result.get("text", "")
-        
+        # Decode the upload once; every stage reads from the same pixels
+        image = DecodedImage(get_storage_backend().local_path(submission.storage_path))
+
         # Get reference answer from question metadata
         reference_text = question_meta.get("model_answer", "")
-        
-        # Run ML-based evaluation
-        ml_evaluation = evaluation_service.evaluate_answer(student_text, reference_text)
-        
-        # Also run traditional scoring for compatibility
-        layout_result = layout_service.detect(submission.storage_path)
-        diagram_result = diagram_service.analyze(submission.storage_path)
-        scoring_result = scoring_service.score(answer=student_text, question_meta=question_meta)
+
+        # Reuse the stored reference embedding so only the student answer is encoded
+        question_id = question_meta.get("question_id")
+        question = session.get(Question, question_id) if question_id else None
+        if question is not None and (question.model_answer or "").strip() == reference_text.strip():
+            reference_embedding = ensure_reference_embedding(question, embedding_engine)
+            if reference_embedding is not None:
+                embedding_engine.prime(reference_text, reference_embedding)
+
+        language = submission.language
+        publish_submission_event(submission_id, "ocr")
+
+        # Layout and diagram analysis don't need OCR, so they overlap with it.
+        # Scoring waits for ML evaluation to reuse the memoized student embedding.
+        stage_results, stage_timings = run_stage_graph(
+            {
+                "ocr": ((), lambda done: ocr_service.run(image, language)),
+                "layout": ((), lambda done: layout_service.detect(image)),
+                "diagram": ((), lambda done: diagram_service.analyze(image)),
+                "ml_evaluation": (
+                    ("ocr",),
+                    lambda done: evaluation_service.evaluate_answer(done["ocr"].get("text", ""), reference_text),
+                ),
+                "scoring": (
+                    ("ocr", "ml_evaluation"),
+                    lambda done: scoring_service.score(answer=done["ocr"].get("text", ""), question_meta=question_meta),
+                ),
+            },
+            max_workers=settings.PIPELINE_MAX_WORKERS,
+        )
+        logger.info("Submission %s stage timings: %s", submission_id, stage_timings)
+
+        ocr_result = stage_results["ocr"]
+        student_text = ocr_result.get("text", "")
+        ml_evaluation = stage_results["ml_evaluation"]
+        publish_submission_event(submission_id, "scored", score=ml_evaluation["score"], confidence=ml_evaluation["confidence"])
 
         aggregated = aggregate_scores(
             ocr_result=ocr_result,
-            scoring_result=scoring_result,
-            layout_result=layout_result,
-            diagram_result=diagram_result,
+            scoring_result=stage_results["scoring"],
+            layout_result=stage_results["layout"],
+            diagram_result=stage_results["diagram"],
+            stage_timings=stage_timings,
         )
 
         # Use ML evaluation score and confidence as primary
@@ -71,17 +162,20 @@ def evaluate_submission(submission_id: int, question_meta: dict) -> dict:
         }
         
         # Flag for review if confidence is low
-        if ml_evaluation["confidence"] < 0.5:
-            evaluation.feedback = "Low AI confidence - Teacher review needed"
-            submission.status = "flagged"
-        else:
-            evaluation.feedback = "Auto-graded with ML"
-            submission.status = "graded"
+        submission.status, evaluation.feedback = ml_review_outcome(ml_evaluation["confidence"])
 
         submission.ocr_confidence = ocr_result.get("confidence")
         submission.language = ocr_result.get("language", submission.language)
 
         session.commit()
+        invalidate_analytics(submission.exam_id)
+        publish_submission_event(
+            submission_id,
+            submission.status,
+            evaluation_id=evaluation.id,
+            score=ml_evaluation["score"],
+            confidence=ml_evaluation["confidence"],
+        )
 
         return {
             "status": submission.status,
@@ -89,6 +183,7 @@ def evaluate_submission(submission_id: int, question_meta: dict) -> dict:
             "score": ml_evaluation["score"],
             "confidence": ml_evaluation["confidence"],
             "student_answer": student_text,
-            "reference_answer": reference_text
+            "reference_answer": reference_text,
+            "timings": stage_timings,
         }
 
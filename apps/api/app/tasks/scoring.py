@@ -1,6 +1,10 @@
 """Celery task for scoring pipeline."""
 
 from app.celery_app import celery_app
+from app.core.database import get_sync_session
+from app.services.analytics_cache_service import invalidate_analytics
+from app.services.exam_scoring_service import ExamScoringService
+from app.services.reference_embedding_service import refresh_exam_embeddings
 from app.services.scoring_service import ScoringService
 
 scoring_service = ScoringService()
@@ -11,6 +15,18 @@ def scoring_pipeline(answer: str, question_meta: dict) -> dict:
     return scoring_service.score(answer=answer, question_meta=question_meta)
 
 
+@celery_app.task(name="app.tasks.scoring.score_exam")
+def score_exam(exam_id: int, question_id: int | None = None, rescore: bool = False) -> dict:
+    with get_sync_session() as session:
+        result = ExamScoringService().score_exam(session, exam_id, question_id, rescore=rescore)
+    if result.get("scored"):
+        invalidate_analytics(exam_id)
+    return result
 
 
-
+@celery_app.task(name="app.tasks.scoring.refresh_reference_embeddings")
+def refresh_reference_embeddings(exam_id: int) -> dict:
+    """Precompute model-answer embeddings after an exam's questions change."""
+    with get_sync_session() as session:
+        refreshed = refresh_exam_embeddings(session, exam_id)
+    return {"exam_id": exam_id, "refreshed": refreshed}
@@ -0,0 +1,119 @@
+"""Decode-once image container shared by the OCR, layout and diagram stages."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import threading
+from pathlib import Path
+from typing import Any
+
+try:
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover
+    cv2 = None  # type: ignore
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+class DecodedImage:
+    """Reads an image file once and exposes lazily derived views.
+
+    The raw bytes, RGB pixels, grayscale pixels, PIL image and downscaled copies
+    are each computed on first access and then reused by every pipeline stage.
+    Views are built under a lock so concurrent stages never decode twice.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(path)
+        self._data: bytes | None = None
+        self._sha256: str | None = None
+        self._rgb: Any | None = None
+        self._gray: Any | None = None
+        self._pil: Any | None = None
+        self._downscaled: dict[int, Any] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def ensure(cls, source: "DecodedImage | str | Path") -> "DecodedImage":
+        return source if isinstance(source, DecodedImage) else cls(source)
+
+    @property
+    def data(self) -> bytes:
+        with self._lock:
+            if self._data is None:
+                self._data = Path(self.path).read_bytes()
+        return self._data
+
+    @property
+    def sha256(self) -> str:
+        with self._lock:
+            if self._sha256 is None:
+                self._sha256 = hashlib.sha256(self.data).hexdigest()
+        return self._sha256
+
+    @property
+    def rgb(self) -> Any:
+        """``HxWx3`` uint8 RGB array."""
+        with self._lock:
+            if self._rgb is None:
+                if cv2 is not None and np is not None:
+                    bgr = cv2.imdecode(np.frombuffer(self.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                    if bgr is None:
+                        raise ValueError(f"Unable to decode image {self.path}")
+                    self._rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+                else:
+                    self._rgb = np.asarray(self.pil)
+        return self._rgb
+
+    @property
+    def gray(self) -> Any:
+        """``HxW`` uint8 grayscale array."""
+        with self._lock:
+            if self._gray is None:
+                if cv2 is not None:
+                    self._gray = cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY)
+                else:
+                    self._gray = np.asarray(self.pil.convert("L"))
+        return self._gray
+
+    @property
+    def pil(self) -> Any:
+        """RGB ``PIL.Image`` view."""
+        with self._lock:
+            if self._pil is None:
+                if self._rgb is not None or cv2 is not None:
+                    self._pil = Image.fromarray(self.rgb)
+                else:
+                    self._pil = Image.open(io.BytesIO(self.data)).convert("RGB")
+        return self._pil
+
+    def release(self) -> None:
+        """Drop cached bytes and pixel views; the content hash is kept."""
+        with self._lock:
+            self._data = self._rgb = self._gray = self._pil = None
+            self._downscaled.clear()
+
+    def downscaled(self, max_side: int) -> Any:
+        """RGB array whose longest side is at most ``max_side`` pixels."""
+        with self._lock:
+            if max_side not in self._downscaled:
+                height, width = self.rgb.shape[:2]
+                scale = max_side / max(height, width)
+                if scale >= 1 or cv2 is None:
+                    self._downscaled[max_side] = self.rgb
+                else:
+                    size = (max(int(width * scale), 1), max(int(height * scale), 1))
+                    self._downscaled[max_side] = cv2.resize(self.rgb, size, interpolation=cv2.INTER_AREA)
+        return self._downscaled[max_side]
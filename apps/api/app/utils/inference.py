@@ -0,0 +1,32 @@
+"""Helpers for preparing ML models for CPU inference."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+try:
+    import torch
+except ImportError:  # pragma: no cover
+    torch = None  # type: ignore
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def apply_inference_precision(model: Any, precision: str | None = None) -> Any:
+    """Return ``model`` converted to the configured inference precision.
+
+    ``int8`` applies dynamic quantization to every ``nn.Linear`` layer, which is
+    where nearly all of the transformer compute lives on CPU. ``fp32`` leaves the
+    model untouched.
+    """
+    precision = (precision or settings.INFERENCE_PRECISION).lower()
+    if precision == "fp32":
+        return model
+    if torch is None:  # pragma: no cover
+        logger.warning("PyTorch not installed; ignoring INFERENCE_PRECISION=%s", precision)
+        return model
+    logger.info("Applying dynamic int8 quantization to %s", type(model).__name__)
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
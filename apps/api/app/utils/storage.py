@@ -1,18 +1,430 @@
-"""Storage helper for Supabase / S3 uploads."""
+"""Storage backends for answer-sheet uploads (local disk or S3-compatible)."""
 
+from __future__ import annotations
+
+import hashlib
 import logging
+import os
+import tempfile
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+try:
+    import boto3  # type: ignore
+    from botocore.config import Config as BotoConfig  # type: ignore
+    from botocore.exceptions import ClientError  # type: ignore
+except ImportError:  # pragma: no cover
+    boto3 = None  # type: ignore
+    BotoConfig = None  # type: ignore
+    ClientError = Exception  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+# Where uploads were written before storage backends existed
+LEGACY_UPLOAD_DIR = BASE_DIR / "storage"
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds ``UPLOAD_MAX_BYTES``."""
+
+
+class EmptyUploadError(ValueError):
+    """Raised when an upload has no content."""
+
+
+def _within(root: Path, key: str) -> Path | None:
+    """``root / key``, or None when ``key`` is absolute or escapes ``root``."""
+    relative = Path(key)
+    if not key or relative.is_absolute() or ".." in relative.parts:
+        return None
+    path = root / relative
+    # Also catches symlinks inside root that point elsewhere
+    if not path.resolve().is_relative_to(root.resolve()):
+        return None
+    return path
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    key: str
+    size: int
+    sha256: str
+
+
+class StorageBackend:
+    """Blob store addressed by string keys.
+
+    Methods are blocking; call them through a thread pool from async code.
+    Workers use ``local_path`` to get a readable file regardless of where the
+    blob actually lives.
+    """
+
+    name = "base"
+    chunk_size = 1024 * 1024
+
+    @property
+    def staging_dir(self) -> Path:
+        """Directory for partially received uploads before they get a key."""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def put_file(self, key: str, source: Path) -> None:
+        """Store ``source`` under ``key``; the source file is consumed."""
+        raise NotImplementedError
+
+    def put_stream(self, key: str, stream: BinaryIO) -> None:
+        raise NotImplementedError
+
+    def iter_chunks(
+        self, key: str, start: int = 0, end: int | None = None, chunk_size: int | None = None
+    ) -> Iterator[bytes]:
+        """Stream bytes ``[start, end)`` of ``key`` (to the end when ``end`` is None)."""
+        raise NotImplementedError
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        return b"".join(self.iter_chunks(key, start, end))
+
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Path:
+        raise NotImplementedError
+
+
+class LocalStorageBackend(StorageBackend):
+    name = "local"
+
+    def __init__(self, root: str | Path | None = None) -> None:
+        root = Path(root or settings.STORAGE_LOCAL_ROOT)
+        self.root = root if root.is_absolute() else BASE_DIR / root
+
+    @property
+    def staging_dir(self) -> Path:
+        # Same filesystem as the blobs so put_file is a rename
+        return self.root / "tmp"
+
+    def _path(self, key: str) -> Path:
+        path = _within(self.root, key)
+        if path is None:
+            raise ValueError(f"Invalid storage key: {key!r}")
+        return path
+
+    def local_path(self, key: str) -> Path:
+        candidate = self._path(key)
+        if candidate.exists():
+            return candidate
+        # Rows from before STORAGE_LOCAL_ROOT hold storage/<file> relative to apps/api
+        legacy = _within(LEGACY_UPLOAD_DIR, key.removeprefix(f"{LEGACY_UPLOAD_DIR.name}/"))
+        if legacy is not None and legacy.exists():
+            return legacy
+        return candidate
+
+    def exists(self, key: str) -> bool:
+        return self.local_path(key).exists()
+
+    def size(self, key: str) -> int:
+        return self.local_path(key).stat().st_size
+
+    def put_file(self, key: str, source: Path) -> None:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+
+    def put_stream(self, key: str, stream: BinaryIO) -> None:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.part")
+        try:
+            with open(tmp_path, "wb") as out:
+                while chunk := stream.read(self.chunk_size):
+                    out.write(chunk)
+            os.replace(tmp_path, target)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def iter_chunks(
+        self, key: str, start: int = 0, end: int | None = None, chunk_size: int | None = None
+    ) -> Iterator[bytes]:
+        chunk_size = chunk_size or self.chunk_size
+        with open(self.local_path(key), "rb") as handle:
+            handle.seek(start)
+            remaining = None if end is None else max(end - start, 0)
+            while remaining is None or remaining > 0:
+                chunk = handle.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> bool:
+        try:
+            self.local_path(key).unlink()
+        except FileNotFoundError:
+            return False
+        logger.debug("Removed stored file %s", key)
+        return True
+
+
+class ReadThroughCache:
+    """Size-bounded local disk LRU of remote blobs for worker nodes.
+
+    Content-addressed keys never change once written, so cached copies need no
+    invalidation; least recently used files are dropped when over budget.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int | None = None) -> None:
+        cache_dir = Path(cache_dir or settings.STORAGE_CACHE_DIR)
+        self.cache_dir = cache_dir if cache_dir.is_absolute() else BASE_DIR / cache_dir
+        self.max_bytes = max_bytes if max_bytes is not None else settings.STORAGE_CACHE_MAX_BYTES
+        self._disk_bytes: int | None = None
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.cache_dir / digest[:2] / (digest + Path(key).suffix)
+
+    def get(self, key: str, fetch: Callable[[str, Path], None]) -> Path:
+        """Return a local copy of ``key``, downloading it with ``fetch`` on a miss."""
+        path = self._path(key)
+        if path.exists():
+            try:
+                os.utime(path)  # mark as recently used for LRU eviction
+            except OSError:  # pragma: no cover
+                pass
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+        try:
+            fetch(key, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        if self._disk_bytes is None:
+            self._evict(keep=path)
+        else:
+            self._disk_bytes += path.stat().st_size
+            if self._disk_bytes > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def _evict(self, keep: Path) -> None:
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:  # pragma: no cover - removed concurrently
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if path == keep:
+                    continue
+                try:
+                    path.unlink()
+                except OSError:  # pragma: no cover
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._disk_bytes = total
+
+
+class S3StorageBackend(StorageBackend):
+    """S3-compatible object storage (AWS S3, MinIO, Supabase Storage's S3 endpoint)."""
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str | None = None,
+        endpoint_url: str | None = None,
+        client=None,
+        cache: ReadThroughCache | None = None,
+    ) -> None:
+        self.bucket = bucket or settings.STORAGE_S3_BUCKET or settings.SUPABASE_BUCKET
+        if client is None:
+            if boto3 is None:
+                raise RuntimeError("boto3 is required for STORAGE_BACKEND=s3")
+            endpoint_url = endpoint_url or settings.STORAGE_S3_ENDPOINT_URL or self._supabase_endpoint()
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url or None,
+                region_name=settings.STORAGE_S3_REGION or None,
+                aws_access_key_id=settings.STORAGE_S3_ACCESS_KEY_ID or None,
+                aws_secret_access_key=settings.STORAGE_S3_SECRET_ACCESS_KEY or None,
+                config=BotoConfig(s3={"addressing_style": "path"}),
+            )
+        self.client = client
+        self.cache = cache or ReadThroughCache()
+
+    @staticmethod
+    def _supabase_endpoint() -> str:
+        if not settings.SUPABASE_URL:
+            return ""
+        return settings.SUPABASE_URL.rstrip("/") + "/storage/v1/s3"
+
+    @property
+    def staging_dir(self) -> Path:
+        return Path(tempfile.gettempdir()) / "answer-sheet-uploads"
+
+    @staticmethod
+    def _is_missing(exc: Exception) -> bool:
+        return getattr(exc, "response", {}).get("Error", {}).get("Code") in {"404", "NoSuchKey", "NotFound"}
+
+    def _head(self, key: str) -> dict:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            if self._is_missing(exc):
+                raise FileNotFoundError(key) from exc
+            raise
+
+    def exists(self, key: str) -> bool:
+        try:
+            self._head(key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def size(self, key: str) -> int:
+        return int(self._head(key)["ContentLength"])
+
+    def put_file(self, key: str, source: Path) -> None:
+        # upload_file switches to multipart uploads for large scans
+        try:
+            self.client.upload_file(str(source), self.bucket, key)
+        finally:
+            Path(source).unlink(missing_ok=True)
+
+    def put_stream(self, key: str, stream: BinaryIO) -> None:
+        self.client.upload_fileobj(stream, self.bucket, key)
+
+    def iter_chunks(
+        self, key: str, start: int = 0, end: int | None = None, chunk_size: int | None = None
+    ) -> Iterator[bytes]:
+        params = {"Bucket": self.bucket, "Key": key}
+        if start or end is not None:
+            if end is not None and end <= start:
+                return
+            params["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        body = self.client.get_object(**params)["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size or self.chunk_size)
+        finally:
+            body.close()
+
+    def delete(self, key: str) -> bool:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+        return True
+
+    def local_path(self, key: str) -> Path:
+        return self.cache.get(key, self._download)
+
+    def _download(self, key: str, target: Path) -> None:
+        self.client.download_file(self.bucket, key, str(target))
+
+
+@lru_cache()
+def get_storage_backend() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3StorageBackend()
+    return LocalStorageBackend()
+
+
+async def _stream_to_temp(
+    upload: UploadFile,
+    directory: Path,
+    max_bytes: int | None,
+    chunk_size: int | None,
+) -> tuple[Path, int, str]:
+    """Copy ``upload`` into a temporary file under ``directory`` in fixed-size chunks.
+
+    Returns the temporary path, byte count and SHA-256 hex digest. The temporary
+    file is removed if the upload is rejected or interrupted.
+    """
+    max_bytes = max_bytes if max_bytes is not None else settings.UPLOAD_MAX_BYTES
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+
+    await aiofiles.os.makedirs(directory, exist_ok=True)
+    tmp_path = directory / f".{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while chunk := await upload.read(chunk_size):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLargeError(f"File exceeds the {max_bytes} byte upload limit")
+                digest.update(chunk)
+                await out.write(chunk)
+        if size == 0:
+            raise EmptyUploadError("File is empty")
+    except BaseException:
+        await _remove_quietly(tmp_path)
+        raise
+    return tmp_path, size, digest.hexdigest()
+
+
+async def _remove_quietly(path: Path) -> None:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+
 
-def save_locally(file_path: Path, data: bytes) -> Path:
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    file_path.write_bytes(data)
-    logger.debug("Saved file locally at %s", file_path)
-    return file_path
+def content_addressed_key(sha256: str) -> str:
+    """Storage key of the blob with digest ``sha256``.
 
+    Two levels of fan-out keep directory sizes manageable for large local stores.
+    """
+    return f"cas/{sha256[:2]}/{sha256[2:4]}/{sha256}"
 
 
+async def save_upload_content_addressed(
+    upload: UploadFile,
+    backend: StorageBackend | None = None,
+    max_bytes: int | None = None,
+    chunk_size: int | None = None,
+) -> StoredFile:
+    """Stream ``upload`` into the content-addressed store of ``backend``.
 
+    The key depends only on the content hash, so uploading identical bytes again
+    resolves to the existing blob and the new copy is discarded.
+    """
+    backend = backend or get_storage_backend()
+    tmp_path, size, sha256 = await _stream_to_temp(upload, backend.staging_dir, max_bytes, chunk_size)
+    key = content_addressed_key(sha256)
+    try:
+        if await run_in_threadpool(backend.exists, key):
+            await _remove_quietly(tmp_path)
+        else:
+            await run_in_threadpool(backend.put_file, key, tmp_path)
+    except BaseException:
+        await _remove_quietly(tmp_path)
+        raise
 
+    logger.debug("Stored %d bytes as %s on %s storage", size, key, backend.name)
+    return StoredFile(key=key, size=size, sha256=sha256)
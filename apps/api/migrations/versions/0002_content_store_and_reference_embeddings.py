@@ -0,0 +1,54 @@
+"""Content-addressed upload store and cached reference embeddings.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("questions") as batch:
+        batch.add_column(sa.Column("model_answer_embedding", sa.LargeBinary(), nullable=True))
+        batch.add_column(sa.Column("embedding_version", sa.String(), nullable=True))
+
+    op.create_table(
+        "stored_objects",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("storage_path", sa.String(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+    with op.batch_alter_table("submissions") as batch:
+        batch.add_column(sa.Column("content_hash", sa.String(64), nullable=True))
+        batch.add_column(sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key(
+            "fk_submissions_content_hash_stored_objects", "stored_objects", ["content_hash"], ["sha256"]
+        )
+        batch.create_foreign_key("fk_submissions_duplicate_of_id_submissions", "submissions", ["duplicate_of_id"], ["id"])
+        batch.create_index("ix_submissions_content_hash", ["content_hash"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submissions") as batch:
+        batch.drop_index("ix_submissions_content_hash")
+        batch.drop_constraint("fk_submissions_duplicate_of_id_submissions", type_="foreignkey")
+        batch.drop_constraint("fk_submissions_content_hash_stored_objects", type_="foreignkey")
+        batch.drop_column("duplicate_of_id")
+        batch.drop_column("content_hash")
+
+    op.drop_table("stored_objects")
+
+    with op.batch_alter_table("questions") as batch:
+        batch.drop_column("embedding_version")
+        batch.drop_column("model_answer_embedding")
@@ -0,0 +1,51 @@
+"""Indexes for hot query paths and one evaluation per submission.
+
+Adds a unique constraint on ``evaluations.submission_id``. Before creating it,
+any duplicate evaluations are collapsed onto the newest row for each
+submission, and their feedback is moved to that row.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_submissions_user_id_created_at_id", "submissions", ["user_id", "created_at", "id"])
+    op.create_index("ix_submissions_status", "submissions", ["status"])
+    op.create_index("ix_questions_exam_id_id", "questions", ["exam_id", "id"])
+    op.create_index("ix_feedback_evaluation_id", "feedback", ["evaluation_id"])
+
+    keep = "SELECT MAX(id) FROM evaluations GROUP BY submission_id"
+    op.execute(
+        f"""
+        UPDATE feedback SET evaluation_id = (
+            SELECT MAX(e2.id) FROM evaluations e2 WHERE e2.submission_id = (
+                SELECT e1.submission_id FROM evaluations e1 WHERE e1.id = feedback.evaluation_id
+            )
+        )
+        WHERE evaluation_id NOT IN ({keep})
+        """
+    )
+    op.execute(f"DELETE FROM evaluations WHERE id NOT IN ({keep})")
+
+    with op.batch_alter_table("evaluations") as batch:
+        batch.create_unique_constraint("uq_evaluations_submission_id", ["submission_id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("evaluations") as batch:
+        batch.drop_constraint("uq_evaluations_submission_id", type_="unique")
+
+    op.drop_index("ix_feedback_evaluation_id", table_name="feedback")
+    op.drop_index("ix_questions_exam_id_id", table_name="questions")
+    op.drop_index("ix_submissions_status", table_name="submissions")
+    op.drop_index("ix_submissions_user_id_created_at_id", table_name="submissions")
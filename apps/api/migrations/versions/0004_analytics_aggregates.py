@@ -0,0 +1,152 @@
+"""Incrementally maintained analytics aggregates, backfilled from evaluations.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# Frozen copies of the tables this revision reads and writes, so later model
+# changes cannot alter what the backfill does. Thresholds match the overview.
+LOW_CONFIDENCE = 0.6
+HIGH_CONFIDENCE = 0.8
+
+evaluations = sa.table(
+    "evaluations",
+    sa.column("submission_id", sa.Integer),
+    sa.column("final_score", sa.Float),
+    sa.column("confidence", sa.Float),
+    sa.column("score_breakdown", sa.JSON),
+)
+submissions = sa.table("submissions", sa.column("id", sa.Integer), sa.column("exam_id", sa.Integer))
+aggregates = sa.table(
+    "analytics_aggregates",
+    sa.column("scope", sa.String),
+    sa.column("evaluation_count", sa.Integer),
+    sa.column("score_sum", sa.Float),
+    sa.column("confidence_low", sa.Integer),
+    sa.column("confidence_medium", sa.Integer),
+    sa.column("confidence_high", sa.Integer),
+)
+keyword_misses = sa.table(
+    "analytics_keyword_misses",
+    sa.column("scope", sa.String),
+    sa.column("keyword", sa.String),
+    sa.column("miss_count", sa.Integer),
+)
+
+
+def _scopes():
+    """(scope expression, GROUP BY columns, WHERE clause) for the global and per-exam rows."""
+    exam_scope = sa.literal("exam:") + sa.cast(submissions.c.exam_id, sa.String)
+    return [
+        (sa.literal("global"), [], None),
+        (exam_scope, [submissions.c.exam_id], submissions.c.exam_id.isnot(None)),
+    ]
+
+
+def _backfill_totals() -> None:
+    confidence = sa.func.coalesce(evaluations.c.confidence, 0.0)
+    joined = evaluations.join(submissions, submissions.c.id == evaluations.c.submission_id)
+    for scope, group_by, where in _scopes():
+        query = sa.select(
+            scope,
+            sa.func.count(),
+            sa.func.coalesce(sa.func.sum(sa.func.coalesce(evaluations.c.final_score, 0.0)), 0.0),
+            sa.func.sum(sa.case((confidence < LOW_CONFIDENCE, 1), else_=0)),
+            sa.func.sum(sa.case(((confidence >= LOW_CONFIDENCE) & (confidence < HIGH_CONFIDENCE), 1), else_=0)),
+            sa.func.sum(sa.case((confidence >= HIGH_CONFIDENCE, 1), else_=0)),
+        ).select_from(joined)
+        if where is not None:
+            query = query.where(where)
+        query = query.group_by(*group_by).having(sa.func.count() > 0)
+        op.execute(
+            aggregates.insert().from_select(
+                ["scope", "evaluation_count", "score_sum", "confidence_low", "confidence_medium", "confidence_high"],
+                query,
+            )
+        )
+
+
+def _keyword_elements(dialect: str):
+    if dialect == "sqlite":
+        return sa.func.json_each(evaluations.c.score_breakdown, "$.scoring.missing_keywords").table_valued("value")
+    path = sa.func.jsonb_extract_path(sa.cast(evaluations.c.score_breakdown, JSONB), "scoring", "missing_keywords")
+    # jsonb_array_elements_text raises on scalars such as JSON null
+    elements = sa.case((sa.func.jsonb_typeof(path) == "array", path), else_=sa.cast(sa.literal("[]"), JSONB))
+    return sa.func.jsonb_array_elements_text(elements).table_valued("value")
+
+
+def _backfill_keyword_misses() -> None:
+    dialect = op.get_context().dialect.name
+    joined = evaluations.join(submissions, submissions.c.id == evaluations.c.submission_id)
+
+    if dialect in {"postgresql", "sqlite"}:
+        element = _keyword_elements(dialect)
+        keyword = sa.cast(element.c.value, sa.String)
+        for scope, group_by, where in _scopes():
+            query = (
+                sa.select(scope, keyword, sa.func.count())
+                .select_from(joined.join(element, sa.true()))
+                .where(keyword.isnot(None))
+            )
+            if where is not None:
+                query = query.where(where)
+            query = query.group_by(*group_by, keyword)
+            op.execute(keyword_misses.insert().from_select(["scope", "keyword", "miss_count"], query))
+        return
+
+    # Dialects without a JSON array expansion: count in Python
+    if op.get_context().as_sql:
+        return
+    counts: Counter = Counter()
+    rows = op.get_bind().execute(sa.select(submissions.c.exam_id, evaluations.c.score_breakdown).select_from(joined))
+    for exam_id, breakdown in rows:
+        missing = ((breakdown or {}).get("scoring") or {}).get("missing_keywords") or []
+        for value in missing:
+            counts[("global", value)] += 1
+            if exam_id is not None:
+                counts[(f"exam:{exam_id}", value)] += 1
+    if counts:
+        op.bulk_insert(
+            keyword_misses,
+            [{"scope": scope, "keyword": value, "miss_count": count} for (scope, value), count in counts.items()],
+        )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_aggregates",
+        sa.Column("scope", sa.String(), primary_key=True),
+        sa.Column("evaluation_count", sa.Integer(), nullable=False),
+        sa.Column("score_sum", sa.Float(), nullable=False),
+        sa.Column("confidence_low", sa.Integer(), nullable=False),
+        sa.Column("confidence_medium", sa.Integer(), nullable=False),
+        sa.Column("confidence_high", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_table(
+        "analytics_keyword_misses",
+        sa.Column("scope", sa.String(), primary_key=True),
+        sa.Column("keyword", sa.String(), primary_key=True),
+        sa.Column("miss_count", sa.Integer(), nullable=False),
+    )
+
+    _backfill_totals()
+    _backfill_keyword_misses()
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_keyword_misses")
+    op.drop_table("analytics_aggregates")
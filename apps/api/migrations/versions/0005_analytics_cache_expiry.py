@@ -0,0 +1,29 @@
+"""TTL and invalidation generation on analytics_cache entries.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("analytics_cache") as batch:
+        batch.add_column(sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True))
+        batch.add_column(sa.Column("generation", sa.Integer(), nullable=True))
+    # Entries written before expiry existed were never refreshed; drop them
+    op.execute("DELETE FROM analytics_cache")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("analytics_cache") as batch:
+        batch.drop_column("generation")
+        batch.drop_column("expires_at")
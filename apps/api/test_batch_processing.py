@@ -0,0 +1,90 @@
+"""Check that one unreadable file does not fail the rest of a batch job, and that
+storage keys cannot reach files outside the storage root."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add apps/api to path
+api_dir = Path(__file__).parent
+if str(api_dir) not in sys.path:
+    sys.path.insert(0, str(api_dir))
+
+_db_path = Path(tempfile.mkdtemp()) / "batch.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_db_path}")
+os.environ.setdefault("SYNC_DATABASE_URL", f"sqlite:///{_db_path}")
+os.environ.setdefault("BATCH_CHUNK_SIZE", "3")
+os.environ.setdefault("STORAGE_LOCAL_ROOT", tempfile.mkdtemp())
+
+from app.celery_app import celery_app
+from app.core.database import Base, get_sync_session, sync_engine
+from app.models import Exam, Job, Submission, User
+from app.tasks import batch, pipeline
+from app.utils.storage import get_storage_backend
+
+
+def _fake_evaluate(submission_id: int, question_meta: dict) -> dict:
+    """Stand-in for the OCR/ML stages: reads the upload like the real pipeline does."""
+    with get_sync_session() as session:
+        submission = session.get(Submission, submission_id)
+        get_storage_backend().local_path(submission.storage_path).read_bytes()
+        submission.status = "graded"
+        session.commit()
+    return {"submission_id": submission_id, "status": "graded"}
+
+
+def test_batch_with_one_bad_file():
+    Base.metadata.create_all(sync_engine)
+    celery_app.conf.task_always_eager = True
+    pipeline._evaluate_submission = _fake_evaluate
+
+    storage = get_storage_backend()
+    with get_sync_session() as session:
+        user = User(email="batch@example.com", hashed_password="x")
+        exam = Exam(name="Batch exam")
+        session.add_all([user, exam])
+        session.flush()
+        submission_ids = []
+        for index in range(5):
+            key = f"cas/sheet-{index}.png"
+            if index != 1:
+                storage.local_path(key).parent.mkdir(parents=True, exist_ok=True)
+                storage.local_path(key).write_bytes(b"scan")
+            submission = Submission(user_id=user.id, exam_id=exam.id, storage_path=key)
+            session.add(submission)
+            session.flush()
+            submission_ids.append(submission.id)
+        session.add(Job(job_id="job-bad-file", job_type="batch_upload", job_metadata={"exam_id": exam.id, "user_id": user.id}))
+        session.commit()
+
+    batch.process_batch_job("job-bad-file", submission_ids)
+
+    with get_sync_session() as session:
+        job = session.query(Job).filter(Job.job_id == "job-bad-file").one()
+        statuses = [entry["status"] for entry in job.result["processed_files"]]
+        submissions = session.query(Submission).order_by(Submission.id).all()
+
+        assert job.status == "completed", job.status
+        assert statuses == ["graded", "failed", "graded", "graded", "graded"], statuses
+        assert job.result["failed"] == 1
+        assert "error" in job.result["processed_files"][1]
+        # The files after the bad one in its chunk were still evaluated
+        assert [submission.status for submission in submissions] == statuses
+    print("✅ batch job completed with per-file outcomes:", statuses)
+
+
+def test_storage_keys_stay_in_root():
+    storage = get_storage_backend()
+    for key in ("/etc/passwd", "../app/core/config.py", "cas/../../.env", ""):
+        try:
+            storage.local_path(key)
+        except ValueError:
+            continue
+        raise AssertionError(f"{key!r} resolved outside the storage root")
+    print("✅ absolute and parent-relative storage keys rejected")
+
+
+if __name__ == "__main__":
+    test_batch_with_one_bad_file()
+    test_storage_keys_stay_in_root()
@@ -0,0 +1,113 @@
+"""Check that SSE streams for finished work close even without a Redis snapshot,
+and that only the owner can subscribe.
+
+Runs against SQLite and fakeredis (``pip install fakeredis``).
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add apps/api to path
+api_dir = Path(__file__).parent
+if str(api_dir) not in sys.path:
+    sys.path.insert(0, str(api_dir))
+
+_db_path = Path(tempfile.mkdtemp()) / "events.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_db_path}")
+os.environ.setdefault("SYNC_DATABASE_URL", f"sqlite:///{_db_path}")
+os.environ.setdefault("EVENT_HEARTBEAT_SECONDS", "0.2")
+
+import fakeredis
+from fastapi import HTTPException
+
+from app.api.routes import events
+from app.core.database import Base, async_session_factory, get_sync_session, sync_engine
+from app.models import Exam, Job, Submission, User
+from app.services import event_service
+
+_redis = fakeredis.FakeAsyncRedis()
+event_service.get_async_redis = lambda: _redis
+
+
+async def _collect(response, timeout: float = 5.0) -> list[dict]:
+    """Read the whole stream; a stream that never closes fails with a timeout."""
+
+    async def read() -> list[dict]:
+        frames = []
+        async for chunk in response.body_iterator:
+            for line in chunk.splitlines():
+                if line.startswith("data: "):
+                    frames.append(json.loads(line[len("data: "):]))
+        return frames
+
+    return await asyncio.wait_for(read(), timeout)
+
+
+async def _stream_finished_work() -> None:
+    async with async_session_factory() as session:
+        graded = await events.submission_events(1, current_user={"id": "1"}, session=session)
+        graded_frames = await _collect(graded)
+    async with async_session_factory() as session:
+        job = await events.batch_events("job-done", current_user={"id": "1"}, session=session)
+        job_frames = await _collect(job)
+
+    assert [frame["stage"] for frame in graded_frames] == ["graded"], graded_frames
+    assert graded_frames[0]["source"] == "database"
+    assert [frame["stage"] for frame in job_frames] == ["completed"], job_frames
+
+    # A live snapshot still wins over the database row
+    await event_service.publish_event_async(
+        event_service.submission_channel(2), "submission", "flagged", submission_id=2
+    )
+    async with async_session_factory() as session:
+        flagged = await events.submission_events(2, current_user={"id": "1"}, session=session)
+        flagged_frames = await _collect(flagged)
+    assert [frame["stage"] for frame in flagged_frames] == ["flagged"], flagged_frames
+    assert "source" not in flagged_frames[0]
+
+    # Other users get the same 404 as for missing ids
+    async with async_session_factory() as session:
+        for stream in (
+            events.submission_events(1, current_user={"id": "2"}, session=session),
+            events.batch_events("job-done", current_user={"id": "2"}, session=session),
+        ):
+            try:
+                await stream
+            except HTTPException as exc:
+                assert exc.status_code == 404, exc.status_code
+            else:
+                raise AssertionError("stream opened for another user's work")
+
+
+def test_stream_closes_without_snapshot():
+    Base.metadata.create_all(sync_engine)
+    with get_sync_session() as session:
+        user = User(email="events@example.com", hashed_password="x")
+        exam = Exam(name="Events exam")
+        session.add_all([user, exam])
+        session.flush()
+        session.add_all(
+            [
+                Submission(user_id=user.id, exam_id=exam.id, storage_path="a.png", status="graded"),
+                Submission(user_id=user.id, exam_id=exam.id, storage_path="b.png", status="processing"),
+                Job(
+                    job_id="job-done",
+                    job_type="batch_upload",
+                    job_metadata={"exam_id": exam.id, "user_id": str(user.id)},
+                    status="completed",
+                    progress=1.0,
+                ),
+            ]
+        )
+        session.commit()
+
+    asyncio.run(_stream_finished_work())
+    print("✅ streams for finished work closed with their terminal status; other users got 404")
+
+
+if __name__ == "__main__":
+    test_stream_closes_without_snapshot()
@@ -0,0 +1,67 @@
+"""Parity check between the ONNX Runtime and PyTorch embedding backends."""
+
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add apps/api to path
+api_dir = Path(__file__).parent
+if str(api_dir) not in sys.path:
+    sys.path.insert(0, str(api_dir))
+
+from sentence_transformers import SentenceTransformer, util
+
+from app.core.config import settings
+from app.services.embedding_backend import OnnxSentenceEncoder, export_onnx_encoder
+
+SENTENCES = [
+    "Photosynthesis happens in leaves using sunlight and chlorophyll.",
+    "Photosynthesis is the process by which green plants use sunlight to synthesize food from carbon dioxide and water.",
+    "Newton's laws describe inertia, force and acceleration, and equal and opposite reactions.",
+    "An ecosystem is a community of organisms interacting with their environment.",
+    "I do not know.",
+]
+
+
+def _mean_latency_ms(model, repeat: int = 20) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.encode(SENTENCES[:2], convert_to_tensor=True, show_progress_bar=False)
+        timings.append(time.perf_counter() - start)
+    return statistics.mean(timings) * 1000
+
+
+def test_onnx_parity(tolerance: float = 1e-3) -> bool:
+    """Embeddings and pairwise similarities must match the torch path."""
+    model_name = settings.SENTENCE_TRANSFORMER_MODEL
+    print("=" * 60)
+    print(f"ONNX PARITY TEST ({model_name})")
+    print("=" * 60)
+
+    torch_model = SentenceTransformer(model_name, device="cpu")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        onnx_model = OnnxSentenceEncoder(export_onnx_encoder(model_name, Path(tmp_dir)))
+
+        torch_embeddings = torch_model.encode(SENTENCES, convert_to_tensor=True, show_progress_bar=False)
+        onnx_embeddings = onnx_model.encode(SENTENCES, convert_to_tensor=True)
+
+        embedding_cos = util.cos_sim(torch_embeddings, onnx_embeddings).diagonal()
+        torch_sims = util.cos_sim(torch_embeddings, torch_embeddings)
+        onnx_sims = util.cos_sim(onnx_embeddings, onnx_embeddings)
+        max_sim_diff = (torch_sims - onnx_sims).abs().max().item()
+
+        print(f"Min embedding cosine (torch vs onnx): {embedding_cos.min().item():.6f}")
+        print(f"Max pairwise similarity difference:   {max_sim_diff:.6f}")
+        print(f"Torch latency per pair:  {_mean_latency_ms(torch_model):.2f} ms")
+        print(f"ONNX latency per pair:   {_mean_latency_ms(onnx_model):.2f} ms")
+
+    passed = embedding_cos.min().item() >= 1 - tolerance and max_sim_diff <= tolerance
+    print(f"Parity within {tolerance}: {'✅ PASS' if passed else '❌ FAIL'}")
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_onnx_parity() else 1)
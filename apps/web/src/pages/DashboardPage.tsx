@@ -14,9 +14,18 @@ type Submission = {
   has_evaluation?: boolean;
 };
 
+type SubmissionStats = {
+  total: number;
+  evaluated: number;
+  by_status: Record<string, number>;
+};
+
 export default function DashboardPage() {
   const api = useApi();
   const [submissions, setSubmissions] = useState<Submission[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [stats, setStats] = useState<SubmissionStats | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [refreshing, setRefreshing] = useState(false);
@@ -24,19 +33,41 @@ export default function DashboardPage() {
 
   const loadSubmissions = async () => {
     try {
-      const res = await api.get("/submissions");
-      console.log("Submissions response:", res.data);
-      const submissionsData = res.data?.submissions || res.data || [];
+      // The list is paginated; totals come from the stats endpoint
+      const [res, statsRes] = await Promise.all([api.get("/submissions"), api.get("/submissions/stats")]);
+      const submissionsData = res.data?.submissions || [];
       setSubmissions(Array.isArray(submissionsData) ? submissionsData : []);
+      setNextCursor(res.data?.next_cursor ?? null);
+      setStats(statsRes.data ?? null);
       setError(null);
     } catch (err: any) {
       console.error("Error loading submissions:", err);
       console.error("Error details:", err.response?.data);
       setSubmissions([]);
-      setError(null);
+      setNextCursor(null);
+      setStats(null);
+      setError("Could not load submissions. Please try again.");
+    }
+  };
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await api.get("/submissions", { params: { cursor: nextCursor } });
+      setSubmissions((current) => [...current, ...(res.data?.submissions || [])]);
+      setNextCursor(res.data?.next_cursor ?? null);
+    } catch (err: any) {
+      console.error("Error loading more submissions:", err);
+      setError("Could not load more submissions. Please try again.");
+    } finally {
+      setLoadingMore(false);
     }
   };
 
+  const countByStatus = (...statuses: string[]) =>
+    statuses.reduce((sum, status) => sum + (stats?.by_status[status] ?? 0), 0);
+
   useEffect(() => {
     async function load() {
       setLoading(true);
@@ -132,18 +163,18 @@ export default function DashboardPage() {
         <div className="grid grid-cols-1 sm:grid-cols-3 gap-4">
           <div className="bg-white rounded-lg shadow-md p-6">
             <p className="text-gray-600 text-sm">Total Submissions</p>
-            <p className="text-3xl font-bold text-gray-900 mt-2">{submissions.length}</p>
+            <p className="text-3xl font-bold text-gray-900 mt-2">{stats?.total ?? 0}</p>
           </div>
           <div className="bg-white rounded-lg shadow-md p-6">
             <p className="text-gray-600 text-sm">Evaluated</p>
             <p className="text-3xl font-bold text-green-600 mt-2">
-              {submissions.filter((s) => s.status === "completed" || s.has_evaluation).length}
+              {stats?.evaluated ?? 0}
             </p>
           </div>
           <div className="bg-white rounded-lg shadow-md p-6">
             <p className="text-gray-600 text-sm">Pending</p>
             <p className="text-3xl font-bold text-blue-600 mt-2">
-              {submissions.filter((s) => s.status === "pending" || s.status === "processing").length}
+              {countByStatus("pending", "processing")}
             </p>
           </div>
         </div>
@@ -228,6 +259,17 @@ export default function DashboardPage() {
                   </div>
                 </div>
               ))}
+              {nextCursor && (
+                <div className="p-6 text-center">
+                  <button
+                    onClick={loadMore}
+                    disabled={loadingMore}
+                    className="px-6 py-3 bg-gray-100 hover:bg-gray-200 text-gray-700 font-semibold rounded-lg transition-all disabled:opacity-50"
+                  >
+                    {loadingMore ? "Loading..." : "Load more"}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -0,0 +1,81 @@
+"""Benchmark per-keyword loop scoring against the batched rapidfuzz cdist path.
+
+Usage:
+    python scripts/benchmark_keyword_scoring.py [--keywords 50] [--answers 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from rapidfuzz import fuzz
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+API_DIR = PROJECT_ROOT / "apps" / "api"
+if str(API_DIR) not in sys.path:
+    sys.path.append(str(API_DIR))
+
+from app.services.scoring_service import ScoringService  # noqa: E402
+from app.utils.text import normalize_text  # noqa: E402
+
+VOCABULARY = (
+    "photosynthesis chlorophyll sunlight carbon dioxide glucose oxygen water leaves energy plant "
+    "inertia force acceleration mass reaction action newton motion velocity friction gravity "
+    "ecosystem biotic abiotic community environment organism habitat population food chain"
+).split()
+
+
+def loop_keyword_score(answer: str, keywords: list[str]) -> tuple[float, list[str], list[str]]:
+    """The original one-keyword-at-a-time implementation."""
+    normalized_answer = normalize_text(answer)
+    total_score = 0.0
+    matched: list[str] = []
+    missed: list[str] = []
+    for keyword in keywords:
+        score = fuzz.partial_ratio(normalized_answer, normalize_text(keyword)) / 100
+        total_score += score
+        (matched if score >= 0.7 else missed).append(keyword)
+    return total_score / len(keywords), matched, missed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keywords", type=int, default=50)
+    parser.add_argument("--answers", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keywords = [" ".join(rng.sample(VOCABULARY, rng.randint(1, 2))) for _ in range(args.keywords)]
+    answers = [" ".join(rng.choices(VOCABULARY, k=rng.randint(20, 80))) for _ in range(args.answers)]
+
+    service = ScoringService.__new__(ScoringService)  # keyword scoring needs no embedding model
+
+    start = time.perf_counter()
+    loop_results = [loop_keyword_score(answer, keywords) for answer in answers]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_results = service.keyword_scores(answers, keywords)
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        1
+        for (loop_avg, loop_hit, loop_miss), (batch_avg, batch_hit, batch_miss) in zip(loop_results, batch_results)
+        if abs(loop_avg - batch_avg) > 1e-9 or loop_hit != batch_hit or loop_miss != batch_miss
+    )
+
+    print(f"{args.keywords} keywords x {args.answers} answers")
+    print(f"  loop:   {loop_seconds * 1000:10.1f} ms")
+    print(f"  cdist:  {batch_seconds * 1000:10.1f} ms")
+    print(f"  speedup {loop_seconds / max(batch_seconds, 1e-9):10.1f}x")
+    print(f"  result mismatches: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
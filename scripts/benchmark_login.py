@@ -0,0 +1,100 @@
+"""Measure login latency and event-loop stalls for inline vs thread-pool bcrypt.
+
+Fires a burst of concurrent password checks, as a room of teachers logging in
+at once would, while a probe coroutine ticks every few milliseconds. The probe's
+worst lag is how long every other request on the worker would have stalled.
+
+Usage:
+    python scripts/benchmark_login.py [--logins 20] [--rounds 10 12 14]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import bcrypt
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+API_DIR = PROJECT_ROOT / "apps" / "api"
+if str(API_DIR) not in sys.path:
+    sys.path.append(str(API_DIR))
+
+from app.auth.passwords import get_password_executor, hash_password, verify_password  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+PASSWORD = "Password123!"
+PROBE_INTERVAL = 0.005
+
+
+async def inline_login(hashed: str) -> bool:
+    """The original handler: bcrypt straight on the event loop."""
+    return bcrypt.checkpw(PASSWORD.encode(), hashed.encode())
+
+
+async def offloaded_login(hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_executor(), verify_password, PASSWORD, hashed)
+
+
+async def probe(stop: asyncio.Event, lags: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + PROBE_INTERVAL
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(max(loop.time() - expected, 0.0))
+
+
+async def run_burst(login, hashed: str, logins: int) -> tuple[list[float], list[float], float]:
+    async def timed() -> float:
+        # Measured from the start of the burst, as a client would see it
+        assert await login(hashed)
+        return time.perf_counter() - start
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    probe_task = asyncio.create_task(probe(stop, lags))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(timed() for _ in range(logins)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await probe_task
+    return list(latencies), lags, wall
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20, help="concurrent logins per burst")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[settings.BCRYPT_ROUNDS])
+    args = parser.parse_args()
+
+    print(f"{args.logins} concurrent logins, {settings.PASSWORD_HASH_MAX_WORKERS} hashing workers")
+    for rounds in args.rounds:
+        hashed = hash_password(PASSWORD, rounds=rounds)
+        start = time.perf_counter()
+        verify_password(PASSWORD, hashed)
+        single_ms = (time.perf_counter() - start) * 1000
+        print(f"\ncost {rounds}: single verify {single_ms:.1f} ms")
+        for name, login in (("inline", inline_login), ("thread pool", offloaded_login)):
+            latencies, lags, wall = asyncio.run(run_burst(login, hashed, args.logins))
+            print(
+                f"  {name:<12} login p50 {percentile(latencies, 50) * 1000:8.1f} ms"
+                f"  p95 {percentile(latencies, 95) * 1000:8.1f} ms"
+                f"  burst {wall * 1000:8.1f} ms"
+                f"  max loop stall {max(lags, default=0.0) * 1000:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Compare fp32 and dynamic int8 inference for the OCR and embedding models.
+
+Reports per-item latency, model size, process RSS growth and the score drift
+introduced by quantization on a fixed set of images and answer pairs.
+
+Usage:
+    python scripts/benchmark_precision.py [--images DIR] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import torch
+from PIL import Image, ImageDraw
+from rapidfuzz import fuzz
+from sentence_transformers import SentenceTransformer, util
+from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+API_DIR = PROJECT_ROOT / "apps" / "api"
+if str(API_DIR) not in sys.path:
+    sys.path.append(str(API_DIR))
+
+from app.core.config import settings  # noqa: E402
+from app.utils.inference import apply_inference_precision  # noqa: E402
+
+SAMPLE_LINES = [
+    "Photosynthesis happens in the leaves",
+    "Chlorophyll absorbs sunlight energy",
+    "Force equals mass times acceleration",
+    "Every action has an equal reaction",
+]
+
+ANSWER_PAIRS = [
+    (
+        "Photosynthesis happens in leaves using sunlight and chlorophyll.",
+        "Photosynthesis is the process by which green plants use sunlight to synthesize food from carbon dioxide and water.",
+    ),
+    (
+        "An object keeps moving unless a force acts on it.",
+        "Newton's laws describe inertia, the relationship between force and acceleration, and equal/opposite reactions.",
+    ),
+    (
+        "An ecosystem is living things and their surroundings.",
+        "An ecosystem is a community of organisms interacting with biotic and abiotic components of their environment.",
+    ),
+    ("I do not know.", "Plants convert carbon dioxide and water into glucose and oxygen."),
+]
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+        import resource
+
+        return pages * resource.getpagesize() / 1024 / 1024
+    except (OSError, ImportError):  # pragma: no cover - non-Linux hosts
+        return 0.0
+
+
+def model_size_mb(model: torch.nn.Module) -> float:
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1024 / 1024
+
+
+def load_images(image_dir: Path | None) -> list[Image.Image]:
+    if image_dir is not None:
+        paths = sorted(p for p in image_dir.iterdir() if p.suffix.lower() in {".png", ".jpg", ".jpeg"})
+        return [Image.open(p).convert("RGB") for p in paths]
+    images = []
+    for line in SAMPLE_LINES:
+        image = Image.new("RGB", (640, 64), "white")
+        ImageDraw.Draw(image).text((10, 20), line, fill="black")
+        images.append(image)
+    return images
+
+
+def bench_ocr(precision: str, images: list[Image.Image], repeat: int) -> dict:
+    before = rss_mb()
+    processor = TrOCRProcessor.from_pretrained(settings.OCR_MODEL_EN)
+    model = VisionEncoderDecoderModel.from_pretrained(settings.OCR_MODEL_EN)
+    model.eval()
+    model = apply_inference_precision(model, precision)
+    loaded = rss_mb()
+
+    texts: list[str] = []
+    timings: list[float] = []
+    with torch.no_grad():
+        for _ in range(repeat):
+            texts = []
+            for image in images:
+                start = time.perf_counter()
+                pixel_values = processor(images=image, return_tensors="pt").pixel_values
+                generated_ids = model.generate(pixel_values)
+                timings.append(time.perf_counter() - start)
+                texts.append(processor.batch_decode(generated_ids, skip_special_tokens=True)[0].strip())
+    return {
+        "latency_ms": statistics.mean(timings) * 1000,
+        "model_mb": model_size_mb(model),
+        "rss_mb": loaded - before,
+        "outputs": texts,
+    }
+
+
+def bench_embeddings(precision: str, repeat: int) -> dict:
+    before = rss_mb()
+    model = apply_inference_precision(SentenceTransformer(settings.SENTENCE_TRANSFORMER_MODEL), precision)
+    loaded = rss_mb()
+
+    scores: list[float] = []
+    timings: list[float] = []
+    for _ in range(repeat):
+        scores = []
+        for answer, reference in ANSWER_PAIRS:
+            start = time.perf_counter()
+            embeddings = model.encode([answer, reference], convert_to_tensor=True, show_progress_bar=False)
+            timings.append(time.perf_counter() - start)
+            scores.append((util.cos_sim(embeddings[0], embeddings[1]).item() + 1) / 2)
+    return {
+        "latency_ms": statistics.mean(timings) * 1000,
+        "model_mb": model_size_mb(model),
+        "rss_mb": loaded - before,
+        "outputs": scores,
+    }
+
+
+def report(name: str, fp32: dict, int8: dict, drift: str) -> None:
+    print(f"\n{name}")
+    print(f"  {'':10}{'fp32':>12}{'int8':>12}")
+    for label, key in (("latency ms", "latency_ms"), ("model MB", "model_mb"), ("RSS +MB", "rss_mb")):
+        print(f"  {label:10}{fp32[key]:>12.1f}{int8[key]:>12.1f}")
+    print(f"  speedup   {fp32['latency_ms'] / max(int8['latency_ms'], 1e-9):>12.2f}x")
+    print(f"  {drift}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=Path, default=None, help="Directory of answer-sheet line images")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    images = load_images(args.images)
+
+    ocr_fp32 = bench_ocr("fp32", images, args.repeat)
+    ocr_int8 = bench_ocr("int8", images, args.repeat)
+    agreement = statistics.mean(fuzz.ratio(a, b) for a, b in zip(ocr_fp32["outputs"], ocr_int8["outputs"]))
+    report(f"TrOCR ({settings.OCR_MODEL_EN}, {len(images)} images)", ocr_fp32, ocr_int8, f"transcript agreement {agreement:.1f}%")
+
+    emb_fp32 = bench_embeddings("fp32", args.repeat)
+    emb_int8 = bench_embeddings("int8", args.repeat)
+    drift = max(abs(a - b) for a, b in zip(emb_fp32["outputs"], emb_int8["outputs"]))
+    report(f"Embeddings ({settings.SENTENCE_TRANSFORMER_MODEL}, {len(ANSWER_PAIRS)} pairs)", emb_fp32, emb_int8, f"max similarity drift {drift:.4f}")
+
+
+if __name__ == "__main__":
+    main()
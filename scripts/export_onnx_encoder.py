@@ -0,0 +1,32 @@
+"""Export the sentence-embedding model to ONNX for the ONNX Runtime backend.
+
+Once exported, EvaluationService and ScoringService pick the ONNX graph up
+automatically (unless EMBEDDING_BACKEND=torch).
+
+Usage:
+    python scripts/export_onnx_encoder.py [MODEL_NAME ...]
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+API_DIR = PROJECT_ROOT / "apps" / "api"
+if str(API_DIR) not in sys.path:
+    sys.path.append(str(API_DIR))
+
+from app.core.config import settings  # noqa: E402
+from app.services.embedding_backend import export_onnx_encoder  # noqa: E402
+
+
+def main() -> None:
+    model_names = sys.argv[1:] or [settings.SENTENCE_TRANSFORMER_MODEL]
+    for model_name in model_names:
+        output_dir = export_onnx_encoder(model_name)
+        print(f"Exported {model_name} -> {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,6 @@ import asyncio
 import sys
 from pathlib import Path
 
-import bcrypt
 from sqlalchemy import select
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -14,6 +13,8 @@ API_DIR = PROJECT_ROOT / "apps" / "api"
 if str(API_DIR) not in sys.path:
     sys.path.append(str(API_DIR))
 
+from app.auth.passwords import hash_password  # noqa: E402
+from app.celery_app import celery_app  # noqa: E402
 from app.core.database import async_session_factory  # noqa: E402
 from app.models import Exam, Question, User  # noqa: E402
 
@@ -24,7 +25,7 @@ async def ensure_default_teacher(session) -> User:
     if user:
         return user
 
-    hashed = bcrypt.hashpw("Password123!".encode(), bcrypt.gensalt()).decode()
+    hashed = hash_password("Password123!")
     user = User(
         email="teacher@example.com",
         full_name="Demo Teacher",
@@ -102,6 +103,12 @@ async def seed() -> None:
         await session.commit()
     print("Seed data applied: teacher@example.com / Science Midterm with questions")
 
+    # Reference embeddings are encoded by a worker, never inside the seed's flush
+    try:
+        celery_app.send_task("app.tasks.scoring.refresh_reference_embeddings", args=[exam.id], retry=False)
+    except Exception as exc:
+        print(f"Could not queue reference embeddings ({exc}); grading will compute them on first use")
+
 
 def main() -> None:
     asyncio.run(seed())